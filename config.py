@@ -16,4 +16,5 @@ if not GOOGLE_MAPS_API_KEY:
 
 # Your other configuration settings
 TRAVEL_MODE = "transit"
+CITY = "Vienna, Austria"  # appended to market names when geocoding
 DEFAULT_STAY_TIME = 30
\ No newline at end of file
@@ -1,24 +1,48 @@
 # main.py
 
+import argparse
+import logging
+
+from modules.cache import DiskCache
 from modules.market_data import load_markets
-from modules.travel_times import build_travel_time_matrix, save_travel_times
+from modules.travel_times import (build_travel_time_matrix, save_travel_times,
+                                  save_travel_times_npy)
 
 # Define file paths
 MARKETS_JSON_INPUT_FILE = "data/real/markets.json"
 TRAVEL_TIMES_OUTPUT_FILE = "data/real/travel_times.json"
+TRAVEL_TIMES_NPY_OUTPUT_FILE = "data/real/travel_times.npy"
 
 def main():
+    parser = argparse.ArgumentParser(description="Build the travel time matrix")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached API results and query Google Maps again")
+    parser.add_argument("--symmetric", action="store_true",
+                        help="Query one direction per pair and mirror it (not for transit)")
+    parser.add_argument("--max-travel-time", type=float, default=None, metavar="MINUTES",
+                        help="Don't query pairs that cannot be reached within this many minutes")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log every request instead of periodic progress")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s",
+                        datefmt="%H:%M:%S")
+
     # 1. Load the markets from your existing JSON file
     markets = load_markets(MARKETS_JSON_INPUT_FILE)
     print(f"📍 Loaded {len(markets)} markets from {MARKETS_JSON_INPUT_FILE}")
 
-    # 2. Build the travel time matrix (this will use the API)
+    # 2. Build the travel time matrix (this will use the API unless cached)
     print("🕒 Building travel time matrix...")
-    matrix = build_travel_time_matrix(markets)
+    with DiskCache(refresh=args.refresh) as cache:
+        matrix = build_travel_time_matrix(markets, cache=cache, symmetric=args.symmetric,
+                                          max_travel_time=args.max_travel_time)
 
     # 3. Save the new matrix
     save_travel_times(matrix, TRAVEL_TIMES_OUTPUT_FILE)
-    print(f"✅ Travel times saved to {TRAVEL_TIMES_OUTPUT_FILE}")
+    save_travel_times_npy(matrix, TRAVEL_TIMES_NPY_OUTPUT_FILE)
+    print(f"✅ Travel times saved to {TRAVEL_TIMES_OUTPUT_FILE} and {TRAVEL_TIMES_NPY_OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,47 @@
+# modules/cache.py
+
+import os
+import shelve
+import time
+
+CACHE_PATH = "data/cache/gmaps"
+
+
+class DiskCache:
+    """Persistent key/value store for Google Maps results.
+
+    Entries are stored together with an optional expiry timestamp. With
+    `refresh=True` every lookup misses, so results are fetched again and
+    overwrite the stored values.
+    """
+
+    def __init__(self, path=CACHE_PATH, refresh=False):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = shelve.open(path)
+        self.refresh = refresh
+
+    def get(self, key, default=None):
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        if self.refresh:
+            return default
+        entry = self._db.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            return default
+        return value
+
+    def set(self, key, value, expire=None):
+        """Store `value` under `key`, optionally expiring after `expire` seconds."""
+        expires_at = time.time() + expire if expire is not None else None
+        self._db[key] = (value, expires_at)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
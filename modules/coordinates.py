@@ -1,34 +1,59 @@
 # modules/coordinates.py
 
-import googlemaps
-from config import GOOGLE_MAPS_API_KEY
+from concurrent.futures import ThreadPoolExecutor
+from config import CITY
+from modules.gmaps_client import get_client
+from modules.market_data import save_markets
 
-def fetch_coordinates(markets):
-    gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
 
+def _geocode(gmaps, market):
+    """Look up one market by name; returns (lat, lng, place_id) or None.
+
+    The CSV only has Maps share links, which the Geocoding API can't resolve,
+    so the query is the market name within the city.
+    """
+    try:
+        result = gmaps.geocode(f"{market.name}, {CITY}")
+        if result:
+            loc = result[0]["geometry"]["location"]
+            return loc["lat"], loc["lng"], result[0].get("place_id")
+        print(f"No location found for {market.name}")
+    except Exception as e:
+        print(f"Error fetching {market.name}: {e}")
+    return None
+
+
+def fetch_coordinates(markets, cache=None, max_workers=10, save_path=None):
+    gmaps = get_client()
+
+    pending = []
     for market in markets:
         # Skip if market already has coordinates
         if market.latitude and market.longitude:
             print(f"{market.name}: Already has coordinates")
             continue
 
-        if not market.url:
-            print(f"No URL for {market.name}, skipping coordinate fetch.")
+        # Markets don't move, so cached coordinates never expire
+        cached = cache.get(f"coords:{market.name}") if cache is not None else None
+        if cached is not None:
+            market.latitude, market.longitude, market.place_id = cached
+            print(f"✔ {market.name}: {market.latitude}, {market.longitude} (cached)")
             continue
-            
-        try:
-            result = gmaps.find_place(
-                input=market.url,
-                input_type="textquery", 
-                fields=["geometry/location"]
-            )
-            if result["candidates"]:
-                loc = result["candidates"][0]["geometry"]["location"]
-                market.latitude = loc["lat"]
-                market.longitude = loc["lng"]
-                print(f"✔ {market.name}: {market.latitude}, {market.longitude}")
-            else:
-                print(f"No location found for {market.name}")
-        except Exception as e:
-            print(f"Error fetching {market.name}: {e}")
-    return markets
\ No newline at end of file
+
+        pending.append(market)
+
+    # Geocoding requests are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda m: _geocode(gmaps, m), pending))
+
+    for market, coords in zip(pending, results):
+        if coords is None:
+            continue
+        market.latitude, market.longitude, market.place_id = coords
+        if cache is not None:
+            cache.set(f"coords:{market.name}", coords)
+        print(f"✔ {market.name}: {market.latitude}, {market.longitude}")
+
+    if save_path is not None:
+        save_markets(markets, save_path)
+    return markets
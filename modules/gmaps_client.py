@@ -0,0 +1,23 @@
+# modules/gmaps_client.py
+
+import googlemaps
+from config import GOOGLE_MAPS_API_KEY
+
+_client = None
+
+
+def get_client():
+    """Return the shared googlemaps client, creating it on first use.
+
+    Reusing one client keeps a single requests.Session, so connections are
+    pooled across geocoding and travel time requests. The client retries
+    transient failures (5xx, over-query-limit) with exponential backoff.
+    """
+    global _client
+    if _client is None:
+        _client = googlemaps.Client(key=GOOGLE_MAPS_API_KEY,
+                                    retry_timeout=30,
+                                    retry_over_query_limit=True,
+                                    queries_per_second=10,
+                                    requests_kwargs={"timeout": 10})
+    return _client
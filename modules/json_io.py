@@ -0,0 +1,30 @@
+# modules/json_io.py
+
+import json
+
+# orjson (part of the 'fast' extra) parses and serializes in C; fall back to the
+# standard library if missing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def load_json(filepath):
+    """Read a JSON file."""
+    if ORJSON_AVAILABLE:
+        with open(filepath, "rb") as f:
+            return orjson.loads(f.read())
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json(data, filepath):
+    """Write `data` as indented UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        with open(filepath, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
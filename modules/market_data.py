@@ -1,11 +1,23 @@
 # modules/market_data.py
 
-import json
-from datetime import datetime
 import csv
 
+from modules.json_io import load_json, dump_json
+
+def _time_to_minutes(t):
+    """Convert an "HH:MM" string to minutes since midnight."""
+    h, _, m = t.partition(":")
+    return int(h) * 60 + int(m)
+
+def _minutes_to_str(v):
+    """Format minutes since midnight as "HH:MM"."""
+    return f"{v // 60:02d}:{v % 60:02d}"
+
 class Market:
-    def __init__(self, id_, name, open_time, close_time, lat=None, lon=None, url=None):
+    # Fixed attribute layout: smaller instances and faster attribute access than __dict__
+    __slots__ = ("id", "name", "latitude", "longitude", "opening_time", "closing_time", "url", "place_id")
+
+    def __init__(self, id_, name, open_time, close_time, lat=None, lon=None, url=None, place_id=None):
         self.id = str(id_)
         self.name = name
         self.latitude = lat
@@ -13,14 +25,15 @@ class Market:
         self.opening_time = self._parse_time(open_time)
         self.closing_time = self._parse_time(close_time)
         self.url = url
+        self.place_id = place_id
 
     def _parse_time(self, t):
-        return datetime.strptime(t, "%H:%M").time()
+        # Stored as minutes since midnight; avoids strptime and makes comparisons integer-only
+        return _time_to_minutes(t)
 
 def load_markets(filepath):
     """Load market information from JSON."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     markets = [
         Market(
@@ -29,7 +42,8 @@ def load_markets(filepath):
             open_time=item["opening_time"],
             close_time=item["closing_time"],
             lat=item["latitude"],
-            lon=item["longitude"]
+            lon=item["longitude"],
+            place_id=item.get("place_id")
         )
         for item in data
     ]
@@ -43,29 +57,23 @@ def save_markets(markets, filepath):
             "name": m.name,
             "latitude": m.latitude,
             "longitude": m.longitude,
-            "opening_time": m.opening_time.strftime("%H:%M"),
-            "closing_time": m.closing_time.strftime("%H:%M"),
+            "opening_time": _minutes_to_str(m.opening_time),
+            "closing_time": _minutes_to_str(m.closing_time),
+            **({"place_id": m.place_id} if m.place_id else {}),
         }
         for m in markets
     ]
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    dump_json(data, filepath)
+
+# CSV format (no header row): Name,URL,OpenTime,CloseTime
+CSV_FIELDS = ["name", "url", "open", "close"]
 
 def load_markets_from_csv(filepath):
     """Load market information from CSV."""
-    markets = []
-    with open(filepath, "r", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        for i, row in enumerate(reader):
-            if not row: # skip empty rows
-                continue
-            # CSV format: Name,URL,OpenTime,CloseTime
-            market = Market(
-                id_=i + 1,       # Auto-generate ID
-                name=row[0],
-                open_time=row[2],
-                close_time=row[3],
-                url=row[1]       # Pass the URL
-            )
-            markets.append(market)
-    return markets
\ No newline at end of file
+    with open(filepath, "r", encoding="utf-8", newline="") as f:
+        # DictReader skips empty rows; IDs are auto-generated in file order
+        reader = csv.DictReader(f, fieldnames=CSV_FIELDS)
+        return [
+            Market(id_=i, name=r["name"], open_time=r["open"], close_time=r["close"], url=r["url"])
+            for i, r in enumerate(reader, 1)
+        ]
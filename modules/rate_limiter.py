@@ -0,0 +1,41 @@
+# modules/rate_limiter.py
+
+import threading
+import time
+
+
+class ElementRateLimiter:
+    """Token bucket charged per Distance Matrix element (origins x destinations).
+
+    The bucket holds up to `capacity` tokens and refills at `refill_rate`
+    tokens per second. Requests larger than the capacity are clamped so they
+    can still go through once the bucket is full.
+    """
+
+    def __init__(self, capacity=500, refill_rate=500.0):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, elements):
+        """Take tokens if available; otherwise return the seconds to wait."""
+        elements = min(elements, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_rate)
+            self._last = now
+            if self._tokens >= elements:
+                self._tokens -= elements
+                return 0.0
+            return (elements - self._tokens) / self.refill_rate
+
+    def acquire(self, elements):
+        """Block until `elements` tokens are available."""
+        while True:
+            wait = self._reserve(elements)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
@@ -1,83 +1,262 @@
 # modules/travel_times.py
 
-import json
+import logging
 import googlemaps
-from time import sleep
-from config import GOOGLE_MAPS_API_KEY, TRAVEL_MODE
-
-def build_travel_time_matrix(markets, delay=0.3):
-    """Builds a travel time matrix using Google Maps API."""
-    gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
-    matrix = {"times": {}}
-    
-    # --- DEBUGGING: Get total number of pairs for progress ---
-    total_pairs = len(markets) * (len(markets) - 1)
-    current_pair = 0
-    print(f"📈 Total pairs to calculate: {total_pairs}")
-    # --- END DEBUGGING ---
-
-    for m1 in markets:
-        matrix["times"][m1.id] = {}
-        for m2 in markets:
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from config import TRAVEL_MODE
+from modules.gmaps_client import get_client
+from modules.json_io import load_json, dump_json
+from modules.rate_limiter import ElementRateLimiter
+
+# Distance Matrix allows at most 100 elements (origins x destinations) per request
+BATCH_SIZE = 10
+
+# Cached travel times are reused for a day; transit schedules rarely change faster,
+# so the departure hour is not part of the cache key
+CACHE_EXPIRE = 86400
+
+# Travel time of pairs the API has no route for (e.g. ZERO_RESULTS); cached like
+# a real time so those blocks aren't requested again on every run
+NO_ROUTE = float("nan")
+
+# Lower-bound model for pruning: straight-line distance at top transit speed
+EARTH_RADIUS_KM = 6371.0
+MAX_SPEED_KMH = 60.0
+
+# Log progress every this many completed requests
+PROGRESS_EVERY = 10
+
+logger = logging.getLogger(__name__)
+
+
+def _chunks(items, size):
+    """Split a list into consecutive chunks of at most `size` items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def haversine_matrix(markets):
+    """Great-circle distances in km between all markets as an (n, n) array."""
+    lat = np.radians(np.array([m.latitude for m in markets], dtype=float))
+    lon = np.radians(np.array([m.longitude for m in markets], dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def located_markets(markets):
+    """Markets that have coordinates; the others are logged and left out."""
+    located = []
+    for m in markets:
+        if m.latitude and m.longitude:
+            located.append(m)
+        else:
+            logger.debug("[SKIPPED] Missing coordinates for %s: (%s, %s)", m.name, m.latitude, m.longitude)
+    return located
+
+
+def _location(market):
+    """Distance Matrix location for a market; place IDs skip server-side geocoding."""
+    if getattr(market, "place_id", None):
+        return f"place_id:{market.place_id}"
+    return (market.latitude, market.longitude)
+
+
+def _fetch_batch(origins, destinations, limiter):
+    """Query one origins x destinations block and return {(from_id, to_id): minutes}."""
+    logger.debug("Processing batch: %d origins x %d destinations", len(origins), len(destinations))
+
+    limiter.acquire(len(origins) * len(destinations))
+    try:
+        result = get_client().distance_matrix(
+            origins=[_location(m) for m in origins],
+            destinations=[_location(m) for m in destinations],
+            mode=TRAVEL_MODE,
+            departure_time="now"
+        )
+        rows = result["rows"]
+    except googlemaps.exceptions.ApiError as e:
+        # The API rejected the request itself (e.g. invalid location); retrying won't help
+        logger.warning("[ERROR] %s", e)
+        rows = None
+    # Transport errors and timeouts were already retried with backoff by the client
+    # and propagate, so they don't silently leave holes in the matrix
+
+    return _parse_rows(rows, origins, destinations)
+
+
+def _parse_rows(rows, origins, destinations):
+    """Turn Distance Matrix `rows` into {(from_id, to_id): minutes}.
+
+    Pairs without a route are NO_ROUTE; None marks pairs whose request failed.
+    """
+    times = {}
+    for a, m1 in enumerate(origins):
+        for b, m2 in enumerate(destinations):
             if m1.id == m2.id:
                 continue
-                
+            element = rows[a]["elements"][b] if rows else None
+            if element is None or element.get("status") != "OK":
+                if element is None:
+                    times[(m1.id, m2.id)] = None
+                    continue
+                # Permanent for this pair (e.g. ZERO_RESULTS: no route)
+                logger.warning("[NO ROUTE] %s -> %s: %s", m1.id, m2.id, element.get("status"))
+                times[(m1.id, m2.id)] = NO_ROUTE
+                continue
+            duration = element["duration"]["value"] / 60  # Minuten
+            times[(m1.id, m2.id)] = round(duration, 1)
+    return times
 
-            current_pair += 1
-            print(f"\nProcessing pair {current_pair}/{total_pairs}: {m1.name} → {m2.name}")
 
-                
-            # Check if coordinates exist for both markets
-            if not all([m1.latitude, m1.longitude, m2.latitude, m2.longitude]):
+def _cache_key(from_id, to_id):
+    return f"{TRAVEL_MODE}:{from_id}:{to_id}"
 
-                print(f"  [SKIPPED] Missing coordinates.")
-                print(f"    - {m1.name}: ({m1.latitude}, {m1.longitude})")
-                print(f"    - {m2.name}: ({m2.latitude}, {m2.longitude})")
 
-                matrix["times"][m1.id][m2.id] = None
-                continue
+def _cached_block(cache, pairs):
+    """Return the times of all `pairs` from the cache, or None if any pair is missing."""
+    times = {}
+    for from_id, to_id in pairs:
+        minutes = cache.get(_cache_key(from_id, to_id))
+        if minutes is None:
+            return None
+        times[(from_id, to_id)] = minutes
+    return times
+
+
+def build_travel_time_matrix(markets, max_workers=10, cache=None,
+                             max_travel_time=None, limiter=None, symmetric=False):
+    """Builds a travel time matrix using the Google Maps Distance Matrix API.
 
-            origin = (m1.latitude, m1.longitude)
-            dest = (m2.latitude, m2.longitude)
-            
+    If a `DiskCache` is given, pairs cached within the last CACHE_EXPIRE
+    seconds (including ones without a route) are taken from it and only
+    blocks with missing pairs are requested.
 
-            print(f"  [API CALL] Origin: {origin} | Dest: {dest} | Mode: {TRAVEL_MODE}")
+    If `max_travel_time` (minutes) is given, pairs whose straight-line lower
+    bound already exceeds it are stored as None, and origins/destinations that
+    are out of reach for a whole block are left out of the request.
 
+    Requests are throttled by an `ElementRateLimiter` shared by all workers.
 
-            try:
-                result = gmaps.directions(
-                    origin,
-                    dest,
-                    mode=TRAVEL_MODE,
-                    departure_time="now"
-                )
-                if result:
-                    duration = result[0]['legs'][0]['duration']['value'] / 60  # Minuten
-                    matrix["times"][m1.id][m2.id] = round(duration, 1)
+    With `symmetric=True` only the upper triangle of blocks is requested and
+    the missing direction is mirrored, halving API usage. Only use this for
+    modes where A->B and B->A take about the same time (not transit).
+    """
+    if limiter is None:
+        limiter = ElementRateLimiter()
 
-                    print(f"  [SUCCESS] Duration: {duration:.1f} minutes")
+    # Fill a dense array (NaN = no travel time) and build the JSON dict once at the end
+    n = len(markets)
+    ids = [m.id for m in markets]
+    index = {market_id: i for i, market_id in enumerate(ids)}
+    times = np.full((n, n), np.nan, dtype=np.float32)
+    fetched = np.zeros((n, n), dtype=bool)
 
-                else:
-                    matrix["times"][m1.id][m2.id] = None
+    # Markets without coordinates cannot be routed; all their pairs stay missing
+    located = located_markets(markets)
 
-                    print(f"  [NO RESULT] API returned no route.")
+    located_idx = np.array([index[m.id] for m in located], dtype=int)
+    reachable = np.zeros((n, n), dtype=bool)
+    if max_travel_time is None:
+        reachable[np.ix_(located_idx, located_idx)] = True
+    else:
+        lower_bound = haversine_matrix(located) / MAX_SPEED_KMH * 60
+        reachable[np.ix_(located_idx, located_idx)] = lower_bound <= max_travel_time
+    np.fill_diagonal(reachable, False)
 
-            except Exception as e:
+    batches = _chunks(located, BATCH_SIZE)
+    tasks = []
+    for i, origin_batch in enumerate(batches):
+        for j, destination_batch in enumerate(batches):
+            if symmetric and j < i:
+                continue
+            block = reachable[np.ix_([index[m.id] for m in origin_batch],
+                                     [index[m.id] for m in destination_batch])]
+            origins = [m for m, keep in zip(origin_batch, block.any(axis=1)) if keep]
+            destinations = [m for m, keep in zip(destination_batch, block.any(axis=0)) if keep]
+            if not origins or not destinations:
+                continue
+            cached = None
+            if cache is not None:
+                pairs = [(m1.id, m2.id) for m1 in origins for m2 in destinations
+                         if reachable[index[m1.id], index[m2.id]]]
+                cached = _cached_block(cache, pairs)
+            if cached is None:
+                tasks.append((origins, destinations))
+                continue
+            for (from_id, to_id), minutes in cached.items():
+                times[index[from_id], index[to_id]] = minutes
+                fetched[index[from_id], index[to_id]] = True
+    logger.info("Total requests to send: %d", len(tasks))
 
-                print(f"  [ERROR] {e}")
+    # Requests are latency-bound, so a small thread pool overlaps the round-trips
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_fetch_batch, origins, destinations, limiter)
+                   for origins, destinations in tasks]
+        for done, future in enumerate(futures, 1):
+            results = future.result()
+            if done % PROGRESS_EVERY == 0:
+                logger.info("%d/%d requests done", done, len(tasks))
+            for (from_id, to_id), minutes in results.items():
+                a, b = index[from_id], index[to_id]
+                if not reachable[a, b]:
+                    continue
+                fetched[a, b] = True
+                if minutes is None:
+                    continue
+                times[a, b] = minutes
+                if cache is not None:
+                    cache.set(_cache_key(from_id, to_id), minutes, expire=CACHE_EXPIRE)
 
-                matrix["times"][m1.id][m2.id] = None
+    if symmetric:
+        mirror = ~fetched & fetched.T
+        times[mirror] = times.T[mirror]
 
-            sleep(delay)
+    missing = int(np.isnan(times).sum()) - n
+    print(f"📈 Sent {len(tasks)} requests; {missing} pairs without a travel time")
 
-    return matrix
+    return {"times": {
+        ids[a]: {ids[b]: None if np.isnan(times[a, b]) else round(float(times[a, b]), 1)
+                 for b in range(n) if b != a}
+        for a in range(n)
+    }}
 
 def save_travel_times(matrix, filepath):
     """Save travel time matrix to JSON."""
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(matrix, f, indent=2, ensure_ascii=False)
+    dump_json(matrix, filepath)
 
 def load_travel_times(filepath):
     """Load travel times JSON."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        return json.load(f)
\ No newline at end of file
+    return load_json(filepath)
+
+def matrix_to_array(matrix):
+    """Convert the nested `matrix["times"]` dict to a dense float64 array.
+
+    Returns (times, ids) where `ids[i]` is the market of row/column i and
+    missing routes are NaN.
+    """
+    ids = list(matrix["times"].keys())
+    index = {market_id: i for i, market_id in enumerate(ids)}
+    times = np.full((len(ids), len(ids)), np.nan, dtype=np.float64)
+    np.fill_diagonal(times, 0.0)
+    for from_id, destinations in matrix["times"].items():
+        for to_id, minutes in destinations.items():
+            if minutes is not None:
+                times[index[from_id], index[to_id]] = minutes
+    return times, ids
+
+def _ids_path(filepath):
+    """Path of the JSON sidecar holding the market ids of a .npy matrix."""
+    return filepath[:-len(".npy")] + ".ids.json" if filepath.endswith(".npy") else filepath + ".ids.json"
+
+def save_travel_times_npy(matrix, filepath):
+    """Save travel time matrix as a dense float64 array (NaN = no route).
+
+    Row/column order is stored in a `.ids.json` sidecar next to the array.
+    float64 holds the JSON's minutes exactly, so either file loads the same
+    problem (see `load_problem_instance(travel_times_npy_path=...)`).
+    """
+    times, ids = matrix_to_array(matrix)
+    np.save(filepath, times)
+    dump_json(ids, _ids_path(filepath))
@@ -7,6 +7,9 @@ import logging
 import sys
 import os
 
+import matplotlib
+matplotlib.use('Agg')  # figures are only saved; pick the backend before pyplot is imported
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -96,10 +99,12 @@ def main():
     if config['data']['use_demo']:
         markets_path = config['data']['demo_markets_path']
         travel_times_path = config['data']['demo_travel_times_path']
+        travel_times_npy_path = None
         logger.info("Using demo data")
     else:
         markets_path = config['data']['real_markets_path']
         travel_times_path = config['data']['real_travel_times_path']
+        travel_times_npy_path = config['data'].get('real_travel_times_npy_path')
         logger.info("Using real data")
     
     # Load problem instance
@@ -109,7 +114,8 @@ def main():
         travel_times_path=travel_times_path,
         num_days=config['problem']['num_days'],
         stay_durations=config['problem']['stay_duration'],
-        transfer_buffer=config['problem']['transfer_buffer']
+        transfer_buffer=config['problem']['transfer_buffer'],
+        travel_times_npy_path=travel_times_npy_path
     )
     
     logger.info(f"Loaded {len(problem.markets)} markets")
@@ -119,8 +125,9 @@ def main():
     output_dir = config['output']['results_dir']
     os.makedirs(output_dir, exist_ok=True)
     
-    # Initialize visualizer
-    visualizer = Visualizer(problem, output_dir)
+    # Initialize visualizer (figures are only saved, so skip pyplot and reuse them)
+    visualizer = Visualizer(problem, output_dir, dpi=config['visualization']['figure_dpi'],
+                            headless=True, reuse_figures=True)
     
     # Solve
     excluded_markets = []
@@ -140,7 +147,7 @@ def main():
         )
         
         daily_solutions.append(solution)
-        if convergence:
+        if convergence is not None:
             all_convergence.append(convergence)
         
         # Update excluded markets
@@ -171,7 +178,7 @@ def main():
                 filename=f"day{day}_statistics.{config['visualization']['figure_format']}"
             )
         
-        if convergence and config['visualization']['plot_convergence']:
+        if convergence is not None and config['visualization']['plot_convergence']:
             visualizer.plot_convergence(
                 convergence,
                 save=config['visualization']['save_figures'],
@@ -180,7 +187,8 @@ def main():
     
     # Multi-day summary
     total_visited = sum(s.total_markets_visited for s in daily_solutions)
-    unvisited = [m.id for m in problem.markets if m.id not in excluded_markets]
+    visited_ids = set(excluded_markets)
+    unvisited = [m.id for m in problem.markets if m.id not in visited_ids]
     
     multi_solution = MultiDaySolution(
         daily_solutions=daily_solutions,
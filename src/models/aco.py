@@ -7,9 +7,144 @@ from datetime import datetime, timedelta, time
 import logging
 from ..models.data_structures import ProblemInstance, Solution
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    # Compiled kernels draw from numba's own per-thread generator, not NumPy's
+    _random = np.random
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    # Same Mersenne Twister stream as numba's, kept private so reseeding it
+    # per ant leaves the caller's global np.random state alone
+    _random = np.random.RandomState()
+
+    def njit(*args, **kwargs):
+        """Fallback: run the kernels as plain NumPy code."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 
 logger = logging.getLogger(__name__)
 
+if not NUMBA_AVAILABLE:
+    logger.warning("numba is not installed; the ACO kernels run as plain NumPy, which is "
+                   "much slower. Install the 'fast' extra to compile them.")
+
+# Options for the hot kernels. fastmath leaves out 'nnan'/'ninf' because unknown
+# travel times are inf; boundscheck is already off by default but kept explicit.
+# nogil releases the GIL while a compiled kernel runs.
+JIT_OPTIONS = dict(
+    cache=True,
+    nogil=True,
+    fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'},
+    boundscheck=False,
+    error_model='numpy',
+)
+
+
+@njit(**JIT_OPTIONS)
+def _roulette_select(weights):
+    """Sample an index with probability proportional to `weights`; -1 if all are 0.
+    
+    Searching the unnormalized cumulative sum skips the division that
+    np.random.choice(p=...) needs. Zero-weight entries form empty intervals
+    and are never picked. (An alias table would not pay off: the weights
+    change with the current time and visited set at every step.)
+    """
+    cumulative = np.cumsum(weights)
+    if cumulative[-1] <= 0:
+        return -1
+    pick = np.searchsorted(cumulative, _random.random() * cumulative[-1], side='right')
+    if pick == len(cumulative):
+        # u * total rounded up to total: take the last nonzero entry
+        pick = np.flatnonzero(weights)[-1]
+    return pick
+
+
+@njit(**JIT_OPTIONS)
+def _construct_route(pher_alpha, dist_beta, travel_matrix, opening_min, closing_min,
+                     latest_arrival, excluded_mask, stay_duration, transfer_buffer, gamma,
+                     route, arrivals):
+    """Let one ant build a route; all markets are addressed by index.
+    
+    `pher_alpha` and `dist_beta` are the pheromone and distance factors of the
+    selection probability, already raised to alpha and -beta.
+    
+    Market indices in visit order are written to `route` and the arrival
+    time (minutes) at each to `arrivals`. Returns (length, total_travel).
+    """
+    available = np.flatnonzero(~excluded_mask)
+    if len(available) == 0:
+        return 0, 0.0
+    
+    # Start at random available market, arriving when it opens
+    current = available[_random.randint(len(available))]
+    visited = excluded_mask.copy()
+    visited[current] = True
+    route[0] = current
+    arrivals[0] = float(opening_min[current])
+    count = 1
+    total_travel = 0.0
+    
+    # current_time is the time we DEPART the current market (after staying)
+    current_time = arrivals[0] + stay_duration
+    
+    while True:
+        distance = np.maximum(travel_matrix[current], 0.01)
+        arrival = current_time + distance + transfer_buffer
+        time_until_close = closing_min - arrival
+        
+        # Feasible: not yet visited and arriving before closing - stay
+        feasible = ~visited & (arrival <= latest_arrival)
+        
+        # Combined probability: pheromone, heuristic and time window urgency
+        # (prefer markets closing soon); infeasible markets get weight 0
+        # instead of being filtered out, so every step is the same array pass
+        weights = (pher_alpha[current]
+                   * dist_beta[current]
+                   * (np.maximum(time_until_close, 1.0) ** -gamma)
+                   * feasible)
+        
+        nxt = _roulette_select(weights)
+        if nxt < 0:
+            break
+        
+        travel_time = travel_matrix[current, nxt]
+        total_travel += travel_time
+        
+        # Ensure we arrive after opening
+        arrival_time = max(current_time + travel_time + transfer_buffer, float(opening_min[nxt]))
+        
+        route[count] = nxt
+        arrivals[count] = arrival_time
+        visited[nxt] = True
+        count += 1
+        
+        current_time = arrival_time + stay_duration
+        current = nxt
+    
+    return count, total_travel
+
+
+@njit(parallel=True, **JIT_OPTIONS)
+def _run_iteration(pher_alpha, dist_beta, travel_matrix, opening_min, closing_min,
+                   latest_arrival, excluded_mask, stay_duration, transfer_buffer, gamma, seeds,
+                   out_routes, out_arrivals, out_lens, out_travels):
+    """Construct one route per seed in parallel; ants only read the pheromones.
+    
+    Each ant reseeds the random state of the thread it runs on, so results
+    don't depend on how ants are scheduled across threads.
+    """
+    for k in prange(len(seeds)):
+        _random.seed(int(seeds[k]))
+        out_lens[k], out_travels[k] = _construct_route(
+            pher_alpha, dist_beta, travel_matrix, opening_min, closing_min,
+            latest_arrival, excluded_mask, stay_duration, transfer_buffer, gamma,
+            out_routes[k], out_arrivals[k]
+        )
+
 
 class AntColonyOptimizer:
     """ACO algorithm for time-constrained market visiting."""
@@ -56,14 +191,27 @@ class AntColonyOptimizer:
         self.elite_weight = elite_weight
         
         np.random.seed(random_seed)
+        # Per-ant seeds come from a private stream; the kernels reseed their own generator
+        self._seed_rng = np.random.RandomState(random_seed)
         
         # Initialize pheromone matrix
         n = len(problem.markets)
-        self.pheromones = np.ones((n, n)) * pheromone_init
+        # float32 halves the memory traffic of the row reads; selection only
+        # uses relative weights, so the lost precision doesn't matter
+        self.pheromones = np.full((n, n), pheromone_init, dtype=np.float32)
+        
+        # Heuristic component (inverse of distance) ** beta never changes
+        self._dist_beta = (np.maximum(problem.travel_matrix, 0.01) ** -self.beta).astype(np.float32)
+        
+        # Deposit per visited market, for regular and elite ants
+        self._inv_n = 1.0 / n
+        self._deposit_coeff = self.Q * self._inv_n
+        self._elite_coeff = self.Q * self.elite_weight * self._inv_n
         
-        # Best solution tracking
+        # Best solution tracking; the route is also kept as market indices
         self.best_solution = None
-        self.convergence_history = []
+        self._best_route_idx = None
+        self.convergence_history = np.zeros(num_iterations, dtype=np.int32)
         
     def solve(self, day: int = 1, excluded_markets: List[int] = None) -> Solution:
         """
@@ -81,38 +229,51 @@ class AntColonyOptimizer:
         
         stay_duration = self.problem.stay_durations[day - 1]
         
+        excluded_mask = np.isin(self.problem.ids, excluded_markets)
+        latest_arrival = self.problem.closing_min - stay_duration
+        
+        # Output buffers shared by all iterations; row k belongs to ant k
+        n = len(self.problem.ids)
+        out_routes = np.full((self.num_ants, n), -1, dtype=np.int64)
+        out_arrivals = np.zeros((self.num_ants, n), dtype=np.float64)
+        out_lens = np.zeros(self.num_ants, dtype=np.int64)
+        out_travels = np.zeros(self.num_ants, dtype=np.float64)
+        
+        best_count = self.best_solution.total_markets_visited if self.best_solution else 0
+        
         logger.info(f"Starting ACO for day {day} with {self.num_iterations} iterations")
         
         for iteration in range(self.num_iterations):
-            solutions = []
-            
-            # Each ant constructs a solution
-            for ant in range(self.num_ants):
-                solution = self._construct_solution(stay_duration, excluded_markets)
-                solutions.append(solution)
+            # Pheromones are fixed while the ants construct, so raise them once
+            pher_alpha = self.pheromones ** np.float32(self.alpha)
             
-            # Update best solution
-            feasible_solutions = [s for s in solutions if s.is_feasible]
-            if feasible_solutions:
-                iteration_best = max(feasible_solutions, 
-                                   key=lambda s: s.total_markets_visited)
-                
-                if (self.best_solution is None or 
-                    iteration_best.total_markets_visited > self.best_solution.total_markets_visited):
-                    self.best_solution = iteration_best
-                    logger.debug(f"Iteration {iteration}: New best with {iteration_best.total_markets_visited} markets")
+            # All ants construct their solutions in parallel
+            seeds = self._seed_rng.randint(0, 2**31 - 1, size=self.num_ants)
+            _run_iteration(
+                pher_alpha, self._dist_beta, self.problem.travel_matrix,
+                self.problem.opening_min, self.problem.closing_min, latest_arrival,
+                excluded_mask, stay_duration, self.problem.transfer_buffer, self.gamma, seeds,
+                out_routes, out_arrivals, out_lens, out_travels
+            )
+            # Update best solution; only an improving route is translated to IDs
+            iteration_best = int(np.argmax(out_lens))
+            best_len = int(out_lens[iteration_best])
+            if best_len > best_count:
+                best_count = best_len
+                self._best_route_idx = out_routes[iteration_best, :best_len].copy()
+                self.best_solution = self._make_solution(
+                    self._best_route_idx, out_arrivals[iteration_best, :best_len],
+                    out_travels[iteration_best], stay_duration
+                )
+                logger.debug(f"Iteration {iteration}: New best with {best_len} markets")
             
             # Track convergence
-            if self.best_solution:
-                self.convergence_history.append(self.best_solution.total_markets_visited)
-            else:
-                self.convergence_history.append(0)
+            self.convergence_history[iteration] = best_count
             
             # Update pheromones
-            self._update_pheromones(solutions)
+            self._update_pheromones(out_routes, out_lens)
             
             if (iteration + 1) % 10 == 0:
-                best_count = self.best_solution.total_markets_visited if self.best_solution else 0
                 logger.info(f"Iteration {iteration + 1}/{self.num_iterations}: Best = {best_count} markets")
         
         if self.best_solution:
@@ -128,175 +289,54 @@ class AntColonyOptimizer:
         
         return self.best_solution
     
-    def _construct_solution(self, stay_duration: int, excluded_markets: List[int]) -> Solution:
-        """Construct a solution using ACO probabilistic selection."""
-        available_markets = [m.id for m in self.problem.markets if m.id not in excluded_markets]
-        
-        if not available_markets:
+    def _make_solution(self, route_idx: np.ndarray, arrival_minutes: np.ndarray,
+                       total_travel: float, stay_duration: int) -> Solution:
+        """Translate an ant's index route into a Solution of market IDs."""
+        if len(route_idx) == 0:
             return Solution([], [], 0, 0, 0, False)
         
-        # Start at random available market
-        current_id = np.random.choice(available_markets)
-        route = [current_id]
-        visited = {current_id}
-        
-        # Start time is when market opens
-        current_market = self.problem.get_market_by_id(current_id)
-        arrival_time_first = self._time_to_minutes(current_market.opening_time)
-        arrival_times = [self._minutes_to_time(arrival_time_first)]
-        
-        # After visiting first market, current_time is when we depart
-        current_time = arrival_time_first + stay_duration
-        
-        # Visit markets until no more can be added
-        while True:
-            next_id = self._select_next_market(current_id, visited, current_time, 
-                                               stay_duration, excluded_markets)
-            if next_id is None:
-                break
-            
-            # Calculate arrival time at next market
-            travel_time = self.problem.get_travel_time(current_id, next_id)
-            current_time += travel_time + self.problem.transfer_buffer
-            
-            next_market = self.problem.get_market_by_id(next_id)
-            arrival_time_minutes = current_time
-            
-            # Check if we can visit (must arrive before latest allowed time)
-            latest_arrival = self._time_to_minutes(next_market.latest_arrival_time(stay_duration))
-            
-            if arrival_time_minutes > latest_arrival:
-                break
-            
-            # Ensure we arrive after opening
-            opening_minutes = self._time_to_minutes(next_market.opening_time)
-            if arrival_time_minutes < opening_minutes:
-                current_time = opening_minutes
-                arrival_time_minutes = opening_minutes
-            
-            route.append(next_id)
-            visited.add(next_id)
-            arrival_times.append(self._minutes_to_time(arrival_time_minutes))
-            
-            # Update current_time to departure from this market
-            current_time = arrival_time_minutes + stay_duration
-            current_id = next_id
-        
-        # Calculate solution metrics
-        total_travel = sum(self.problem.get_travel_time(route[i], route[i+1]) 
-                          for i in range(len(route)-1))
+        route = [int(market_id) for market_id in self.problem.ids[route_idx]]
         total_time = total_travel + len(route) * stay_duration
         
         return Solution(
             route=route,
-            arrival_times=arrival_times,
+            arrival_times=[self._minutes_to_time(t) for t in arrival_minutes],
             total_markets_visited=len(route),
             total_travel_time=total_travel,
             total_time=total_time,
             is_feasible=True
         )
     
-    def _select_next_market(self, current_id: int, visited: set, current_time: float,
-                           stay_duration: int, excluded_markets: List[int]) -> int:
-        """Select next market using ACO probability.
+    def _update_pheromones(self, routes: np.ndarray, lengths: np.ndarray):
+        """Update pheromone matrix from the index routes of all ants.
         
-        Note: current_time is the time we DEPART the current market (after staying).
+        Row k of `routes` holds ant k's route in its first `lengths[k]` entries.
         """
-        # Filter feasible markets considering time windows
-        available = []
-        for m in self.problem.markets:
-            if m.id in visited or m.id in excluded_markets:
-                continue
-            
-            # Check time feasibility
-            travel_time = self.problem.get_travel_time(current_id, m.id)
-            # Arrival at next market (including buffer which is added in construct_solution)
-            arrival = current_time + travel_time + self.problem.transfer_buffer
-            latest = self._time_to_minutes(m.latest_arrival_time(stay_duration))
-            
-            if arrival <= latest:
-                available.append(m)
-        
-        if not available:
-            return None
+        # Edge (k, i) leads from routes[k, i] to routes[k, i + 1]
+        on_route = np.arange(routes.shape[1] - 1) < (lengths - 1)[:, None]
+        from_idx = routes[:, :-1][on_route]
+        to_idx = routes[:, 1:][on_route]
         
-        probabilities = []
-        market_ids = []
+        # Pheromone amount proportional to number of markets visited
+        deposits = np.broadcast_to(
+            (self._deposit_coeff * lengths)[:, None], on_route.shape
+        )[on_route]
         
-        current_idx = self._get_market_index(current_id)
-        
-        for market in available:
-            market_idx = self._get_market_index(market.id)
-            
-            # Pheromone component
-            pheromone = self.pheromones[current_idx, market_idx]
-            
-            # Heuristic component (inverse of distance)
-            distance = self.problem.get_travel_time(current_id, market.id)
-            if distance == 0:
-                distance = 0.01
-            heuristic = 1.0 / distance
-            
-            # Time window urgency (prefer markets closing soon)
-            time_after_travel = current_time + distance + self.problem.transfer_buffer
-            closing_minutes = self._time_to_minutes(market.closing_time)
-            time_until_close = closing_minutes - time_after_travel
-            urgency = 1.0 / max(time_until_close, 1.0)
+        # Elite ant strategy
+        if self.use_elite and self._best_route_idx is not None and len(self._best_route_idx) > 1:
+            elite_route = self._best_route_idx
+            elite_deposit = self._elite_coeff * self.best_solution.total_markets_visited
             
-            # Combined probability
-            prob = (pheromone ** self.alpha) * (heuristic ** self.beta) * (urgency ** self.gamma)
-            probabilities.append(prob)
-            market_ids.append(market.id)
-        
-        if not probabilities:
-            return None
+            from_idx = np.concatenate([from_idx, elite_route[:-1]])
+            to_idx = np.concatenate([to_idx, elite_route[1:]])
+            deposits = np.concatenate([deposits, np.full(len(elite_route) - 1, elite_deposit)])
         
-        # Normalize probabilities
-        probabilities = np.array(probabilities)
-        probabilities = probabilities / probabilities.sum()
-        
-        # Select market
-        selected_id = np.random.choice(market_ids, p=probabilities)
-        return selected_id
-    
-    def _update_pheromones(self, solutions: List[Solution]):
-        """Update pheromone matrix based on solutions."""
-        # Evaporation
+        # Sum deposits per edge in one bincount pass (duplicate edges across
+        # ants are common), then evaporate and add as two dense sweeps
+        n = self.pheromones.shape[0]
+        delta = np.bincount(from_idx * n + to_idx, weights=deposits, minlength=n * n)
         self.pheromones *= (1 - self.evaporation)
-        
-        # Deposit pheromones
-        for solution in solutions:
-            if not solution.is_feasible or len(solution.route) < 2:
-                continue
-            
-            # Pheromone amount proportional to number of markets visited
-            deposit = self.Q * solution.total_markets_visited / len(self.problem.markets)
-            
-            for i in range(len(solution.route) - 1):
-                from_idx = self._get_market_index(solution.route[i])
-                to_idx = self._get_market_index(solution.route[i + 1])
-                self.pheromones[from_idx, to_idx] += deposit
-        
-        # Elite ant strategy
-        if self.use_elite and self.best_solution and len(self.best_solution.route) > 1:
-            elite_deposit = self.Q * self.best_solution.total_markets_visited * self.elite_weight
-            elite_deposit /= len(self.problem.markets)
-            
-            for i in range(len(self.best_solution.route) - 1):
-                from_idx = self._get_market_index(self.best_solution.route[i])
-                to_idx = self._get_market_index(self.best_solution.route[i + 1])
-                self.pheromones[from_idx, to_idx] += elite_deposit
-    
-    def _get_market_index(self, market_id: int) -> int:
-        """Get array index for market ID."""
-        for i, m in enumerate(self.problem.markets):
-            if m.id == market_id:
-                return i
-        return 0
-    
-    def _time_to_minutes(self, t: time) -> float:
-        """Convert time to minutes since midnight."""
-        return t.hour * 60 + t.minute
+        self.pheromones += delta.reshape(n, n).astype(np.float32)
     
     def _minutes_to_time(self, minutes: float) -> time:
         """Convert minutes since midnight to time."""
@@ -3,11 +3,17 @@ Data structures for the Christmas Market optimization problem.
 """
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
-from datetime import time, datetime, timedelta
+from datetime import time
+import html
 import json
+import sys
+import numpy as np
 
+# Instances get __slots__ (no per-instance __dict__) where dataclasses support it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Market:
     """Represents a Christmas market with its constraints."""
     id: int
@@ -17,22 +23,41 @@ class Market:
     opening_time: time
     closing_time: time
     description: str = ""
+    opening_min: int = field(init=False, repr=False)  # minutes since midnight
+    closing_min: int = field(init=False, repr=False)  # minutes since midnight
+    opening_str: str = field(init=False, repr=False)  # 'HH:MM'
+    closing_str: str = field(init=False, repr=False)  # 'HH:MM'
+    name_html: str = field(init=False, repr=False)  # name escaped for HTML popups
+    
+    def __post_init__(self):
+        self.opening_min = self.opening_time.hour * 60 + self.opening_time.minute
+        self.closing_min = self.closing_time.hour * 60 + self.closing_time.minute
+        self.opening_str = self.opening_time.strftime('%H:%M')
+        self.closing_str = self.closing_time.strftime('%H:%M')
+        self.name_html = html.escape(self.name)
     
     def is_open_at(self, current_time: time) -> bool:
         """Check if market is open at given time."""
         return self.opening_time <= current_time <= self.closing_time
     
+    def is_open_at_min(self, minutes: int) -> bool:
+        """Check if market is open at the given minutes since midnight."""
+        return self.opening_min <= minutes <= self.closing_min
+    
+    def latest_arrival_min(self, stay_duration_minutes: int) -> int:
+        """Latest arrival in minutes since midnight given stay duration."""
+        return self.closing_min - stay_duration_minutes
+    
     def latest_arrival_time(self, stay_duration_minutes: int) -> time:
         """Calculate latest arrival time given stay duration."""
-        closing_datetime = datetime.combine(datetime.today(), self.closing_time)
-        latest_datetime = closing_datetime - timedelta(minutes=stay_duration_minutes)
-        return latest_datetime.time()
+        hours, minutes = divmod(self.latest_arrival_min(stay_duration_minutes) % (24 * 60), 60)
+        return time(hours, minutes)
     
     def __repr__(self):
         return f"Market({self.id}: {self.name})"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Solution:
     """Represents a solution to the optimization problem."""
     route: List[int]  # List of market IDs in visit order
@@ -42,6 +67,11 @@ class Solution:
     total_time: float  # in minutes (including stay duration)
     is_feasible: bool
     day: int = 1
+    arrival_min: np.ndarray = field(init=False, repr=False, compare=False)  # minutes since midnight
+    
+    def __post_init__(self):
+        self.arrival_min = np.fromiter((t.hour * 60 + t.minute for t in self.arrival_times),
+                                       dtype=np.int32, count=len(self.arrival_times))
     
     def __repr__(self):
         return (f"Solution(markets={self.total_markets_visited}, "
@@ -49,7 +79,7 @@ class Solution:
                 f"feasible={self.is_feasible})")
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MultiDaySolution:
     """Represents a multi-day solution."""
     daily_solutions: List[Solution]
@@ -61,7 +91,7 @@ class MultiDaySolution:
                 f"{self.total_markets_visited} markets)")
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProblemInstance:
     """Contains all data for the optimization problem."""
     markets: List[Market]
@@ -70,39 +100,113 @@ class ProblemInstance:
     stay_durations: List[int]  # Stay duration per day
     transfer_buffer: int = 5  # Buffer time for transfers
     
+    # Dense lookups derived from markets/travel_times, indexed by position in `markets`
+    id_to_idx: Dict[int, int] = field(init=False, repr=False)
+    ids: np.ndarray = field(init=False, repr=False)  # market ID at each index
+    names: List[str] = field(init=False, repr=False)
+    lat: np.ndarray = field(init=False, repr=False)
+    lon: np.ndarray = field(init=False, repr=False)
+    travel_matrix: np.ndarray = field(init=False, repr=False)  # (n, n) minutes, inf if unknown
+    opening_min: np.ndarray = field(init=False, repr=False)  # minutes since midnight
+    closing_min: np.ndarray = field(init=False, repr=False)  # minutes since midnight
+    earliest_opening: Optional[time] = field(init=False, repr=False)  # None without markets
+    latest_closing: Optional[time] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        n = len(self.markets)
+        self.id_to_idx = {m.id: i for i, m in enumerate(self.markets)}
+        
+        # Missing directions fall back to the reverse direction, then to inf
+        self.travel_matrix = np.full((n, n), np.inf, dtype=np.float64)
+        for (from_id, to_id), minutes in self.travel_times.items():
+            if from_id not in self.id_to_idx or to_id not in self.id_to_idx:
+                continue
+            i, j = self.id_to_idx[from_id], self.id_to_idx[to_id]
+            self.travel_matrix[i, j] = minutes
+            if (to_id, from_id) not in self.travel_times:
+                self.travel_matrix[j, i] = minutes
+        np.fill_diagonal(self.travel_matrix, 0.0)
+        
+        self.ids = np.array([m.id for m in self.markets], dtype=np.int32)
+        self.names = [m.name for m in self.markets]
+        self.lat = np.array([m.latitude for m in self.markets], dtype=np.float32)
+        self.lon = np.array([m.longitude for m in self.markets], dtype=np.float32)
+        self.opening_min = np.array([m.opening_min for m in self.markets], dtype=np.int32)
+        self.closing_min = np.array([m.closing_min for m in self.markets], dtype=np.int32)
+        self.earliest_opening = min((m.opening_time for m in self.markets), default=None)
+        self.latest_closing = max((m.closing_time for m in self.markets), default=None)
+    
     def get_travel_time(self, from_id: int, to_id: int) -> float:
-        """Get travel time between two markets."""
+        """Get travel time between two markets; inf if either ID is unknown."""
         if from_id == to_id:
             return 0.0
-        return self.travel_times.get((from_id, to_id), 
-                                     self.travel_times.get((to_id, from_id), float('inf')))
+        from_idx = self.id_to_idx.get(from_id)
+        to_idx = self.id_to_idx.get(to_id)
+        if from_idx is None or to_idx is None:
+            return float('inf')
+        return self.travel_matrix[from_idx, to_idx]
+    
+    def get_leg_travel_times(self, route: List[int]) -> np.ndarray:
+        """Travel time of each leg of a route of market IDs (one fewer than stops).
+        
+        Legs from or to an unknown ID take inf, as in `get_travel_time`.
+        """
+        idx = np.fromiter((self.id_to_idx.get(mid, -1) for mid in route), dtype=np.intp, count=len(route))
+        legs = self.travel_matrix[idx[:-1], idx[1:]]
+        unknown = idx < 0
+        legs[unknown[:-1] | unknown[1:]] = np.inf
+        return legs
     
     def get_market_by_id(self, market_id: int) -> Optional[Market]:
         """Get market by ID."""
-        for market in self.markets:
-            if market.id == market_id:
-                return market
-        return None
+        idx = self.id_to_idx.get(market_id)
+        return self.markets[idx] if idx is not None else None
     
     def get_earliest_opening(self) -> time:
         """Get earliest opening time across all markets."""
-        return min(m.opening_time for m in self.markets)
+        return self.earliest_opening
     
     def get_latest_closing(self) -> time:
         """Get latest closing time across all markets."""
-        return max(m.closing_time for m in self.markets)
+        return self.latest_closing
     
     def get_day_bounds(self) -> tuple:
         """Get (start_time, end_time) for a day."""
         return self.get_earliest_opening(), self.get_latest_closing()
 
 
+def _parse_time(value: str) -> time:
+    """Parse an 'HH:MM' string without going through datetime.strptime."""
+    hours, minutes = value.split(':')
+    return time(int(hours), int(minutes))
+
+
+def _load_travel_times_npy(npy_path: str) -> Dict[tuple, float]:
+    """Read a matrix written by `modules.travel_times.save_travel_times_npy`
+    (NaN = no route; market IDs in the `.ids.json` sidecar) into
+    {(from_id, to_id): minutes}; skips parsing the nested JSON dict."""
+    times = np.load(npy_path)
+    with open(npy_path[:-len('.npy')] + '.ids.json', 'r') as f:
+        ids = [int(market_id) for market_id in json.load(f)]
+    
+    known = ~np.isnan(times)
+    np.fill_diagonal(known, False)
+    rows, cols = np.nonzero(known)
+    minutes = times[rows, cols].astype(np.float64)
+    return {(ids[i], ids[j]): m for i, j, m in zip(rows.tolist(), cols.tolist(), minutes.tolist())}
+
+
 def load_problem_instance(markets_path: str, 
                           travel_times_path: str,
                           num_days: int = 1,
                           stay_durations: List[int] = None,
-                          transfer_buffer: int = 5) -> ProblemInstance:
-    """Load problem instance from JSON files."""
+                          transfer_buffer: int = 5,
+                          travel_times_npy_path: Optional[str] = None) -> ProblemInstance:
+    """Load problem instance from JSON files.
+    
+    If `travel_times_npy_path` is given, travel times are read from that dense
+    .npy matrix instead of the JSON at `travel_times_path`.
+    """
     
     # Load markets
     with open(markets_path, 'r') as f:
@@ -110,8 +214,8 @@ def load_problem_instance(markets_path: str,
     
     markets = []
     for m in markets_data:
-        opening = datetime.strptime(m['opening_time'], '%H:%M').time()
-        closing = datetime.strptime(m['closing_time'], '%H:%M').time()
+        opening = _parse_time(m['opening_time'])
+        closing = _parse_time(m['closing_time'])
         markets.append(Market(
             id=int(m['id']),  # Convert to int to match travel_times keys
             name=m['name'],
@@ -123,13 +227,16 @@ def load_problem_instance(markets_path: str,
         ))
     
     # Load travel times
-    with open(travel_times_path, 'r') as f:
-        travel_data = json.load(f)
-    
-    travel_times = {}
-    for from_id, destinations in travel_data['times'].items():
-        for to_id, time_minutes in destinations.items():
-            travel_times[(int(from_id), int(to_id))] = float(time_minutes)
+    if travel_times_npy_path is not None:
+        travel_times = _load_travel_times_npy(travel_times_npy_path)
+    else:
+        with open(travel_times_path, 'r') as f:
+            travel_data = json.load(f)
+        
+        travel_times = {}
+        for from_id, destinations in travel_data['times'].items():
+            for to_id, time_minutes in destinations.items():
+                travel_times[(int(from_id), int(to_id))] = float(time_minutes)
     
     # Set default stay durations
     if stay_durations is None:
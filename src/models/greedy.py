@@ -1,6 +1,7 @@
 """
 Greedy algorithms for the Christmas Market problem.
 """
+import numpy as np
 from typing import List
 from datetime import time, datetime, timedelta
 import logging
@@ -44,13 +45,28 @@ class GreedyOptimizer:
             excluded_markets = []
         
         stay_duration = self.problem.stay_durations[day - 1]
+        excluded_mask = np.isin(self.problem.ids, excluded_markets)
+        
+        # Per-day arrays shared by all restarts
+        latest_arrival = self.problem.closing_min - stay_duration
+        available = np.flatnonzero(~excluded_mask)
+        
+        # Upper bound on a route's length per start: markets still open for a visit
+        # once we leave the start market (travel times only make arrivals later)
+        earliest_next = self.problem.opening_min[available] + stay_duration + self.problem.transfer_buffer
+        bounds = 1 + (latest_arrival[available][None, :] >= earliest_next[:, None]).sum(axis=1)
+        bounds -= latest_arrival[available] >= earliest_next  # start itself
         
         # Try starting from each available market
         best_solution = None
-        available_starts = [m for m in self.problem.markets if m.id not in excluded_markets]
         
-        for start_market in available_starts:
-            solution = self._construct_solution(start_market, stay_duration, excluded_markets)
+        for start_idx, bound in zip(available, bounds):
+            # Skip starts that cannot beat the best route found so far
+            if best_solution is not None and bound <= best_solution.total_markets_visited:
+                continue
+            
+            solution = self._construct_solution(self.problem.markets[start_idx], stay_duration,
+                                                excluded_mask, latest_arrival)
             
             if solution.is_feasible:
                 if (best_solution is None or 
@@ -67,39 +83,39 @@ class GreedyOptimizer:
         return best_solution
     
     def _construct_solution(self, start_market: Market, stay_duration: int,
-                           excluded_markets: List[int]) -> Solution:
+                           excluded_mask: np.ndarray, latest_arrival: np.ndarray) -> Solution:
         """Construct a greedy solution starting from given market."""
         route = [start_market.id]
-        visited = {start_market.id}
+        visited = np.zeros(len(self.problem.markets), dtype=bool)
+        visited[self.problem.id_to_idx[start_market.id]] = True
         
-        current_time = self._time_to_minutes(start_market.opening_time)
+        current_time = start_market.opening_min
         arrival_times = [self._minutes_to_time(current_time)]
         current_id = start_market.id
+        total_travel = 0.0
         
         while True:
             next_market = self._select_next_market(current_id, visited, current_time,
-                                                   stay_duration, excluded_markets)
+                                                   stay_duration, excluded_mask, latest_arrival)
             if next_market is None:
                 break
             
             travel_time = self.problem.get_travel_time(current_id, next_market.id)
             current_time += stay_duration + travel_time + self.problem.transfer_buffer
             
-            latest_arrival = self._time_to_minutes(next_market.latest_arrival_time(stay_duration))
-            if current_time > latest_arrival:
+            if current_time > latest_arrival[self.problem.id_to_idx[next_market.id]]:
                 break
             
-            opening_minutes = self._time_to_minutes(next_market.opening_time)
+            opening_minutes = next_market.opening_min
             if current_time < opening_minutes:
                 current_time = opening_minutes
             
             route.append(next_market.id)
-            visited.add(next_market.id)
+            total_travel += travel_time
+            visited[self.problem.id_to_idx[next_market.id]] = True
             arrival_times.append(self._minutes_to_time(current_time))
             current_id = next_market.id
         
-        total_travel = sum(self.problem.get_travel_time(route[i], route[i+1])
-                          for i in range(len(route)-1))
         total_time = total_travel + len(route) * stay_duration
         
         return Solution(
@@ -111,23 +127,27 @@ class GreedyOptimizer:
             is_feasible=True
         )
     
-    def _select_next_market(self, current_id: int, visited: set, current_time: float,
-                           stay_duration: int, excluded_markets: List[int]) -> Market:
+    def _select_next_market(self, current_id: int, visited: np.ndarray, current_time: float,
+                           stay_duration: int, excluded_mask: np.ndarray,
+                           latest_arrival: np.ndarray) -> Market:
         """Select next market based on heuristic."""
-        available = [m for m in self.problem.markets
-                    if m.id not in visited and m.id not in excluded_markets]
+        candidates = np.flatnonzero(~(visited | excluded_mask))
         
-        if not available:
+        if len(candidates) == 0:
             return None
         
+        if self.heuristic == "hybrid":
+            return self._select_hybrid(current_id, candidates, current_time, stay_duration,
+                                       latest_arrival)
+        
+        available = [self.problem.markets[i] for i in candidates]
+        
         if self.heuristic == "nearest":
             return self._select_nearest(current_id, available)
         elif self.heuristic == "earliest_closing":
             return self._select_earliest_closing(current_id, available, current_time, stay_duration)
-        elif self.heuristic == "time_efficient":
+        else:  # time_efficient
             return self._select_time_efficient(current_id, available, current_time, stay_duration)
-        else:  # hybrid
-            return self._select_hybrid(current_id, available, current_time, stay_duration)
     
     def _select_nearest(self, current_id: int, markets: List[Market]) -> Market:
         """Select nearest market."""
@@ -140,7 +160,7 @@ class GreedyOptimizer:
         for m in markets:
             travel_time = self.problem.get_travel_time(current_id, m.id)
             arrival = current_time + stay_duration + travel_time + self.problem.transfer_buffer
-            latest = self._time_to_minutes(m.latest_arrival_time(stay_duration))
+            latest = m.latest_arrival_min(stay_duration)
             
             if arrival <= latest:
                 valid_markets.append(m)
@@ -148,7 +168,7 @@ class GreedyOptimizer:
         if not valid_markets:
             return None
         
-        return min(valid_markets, key=lambda m: self._time_to_minutes(m.closing_time))
+        return min(valid_markets, key=lambda m: m.closing_min)
     
     def _select_time_efficient(self, current_id: int, markets: List[Market],
                               current_time: float, stay_duration: int) -> Market:
@@ -159,63 +179,46 @@ class GreedyOptimizer:
         for m in markets:
             travel_time = self.problem.get_travel_time(current_id, m.id)
             arrival = current_time + stay_duration + travel_time + self.problem.transfer_buffer
-            latest = self._time_to_minutes(m.latest_arrival_time(stay_duration))
+            latest = m.latest_arrival_min(stay_duration)
             
             if arrival <= latest:
-                score = travel_time / max(1, self._time_to_minutes(m.closing_time) - arrival)
+                score = travel_time / max(1, m.closing_min - arrival)
                 if score < best_score:
                     best_score = score
                     best_market = m
         
         return best_market
     
-    def _select_hybrid(self, current_id: int, markets: List[Market],
-                      current_time: float, stay_duration: int) -> Market:
-        """Select market using hybrid heuristic."""
-        best_market = None
-        best_score = float('inf')
+    def _select_hybrid(self, current_id: int, candidates: np.ndarray,
+                      current_time: float, stay_duration: int,
+                      latest_arrival: np.ndarray) -> Market:
+        """Select market using hybrid heuristic.
         
-        # Find valid markets first
-        valid_markets = []
-        for m in markets:
-            travel_time = self.problem.get_travel_time(current_id, m.id)
-            arrival = current_time + stay_duration + travel_time + self.problem.transfer_buffer
-            latest = self._time_to_minutes(m.latest_arrival_time(stay_duration))
-            
-            if arrival <= latest:
-                valid_markets.append((m, travel_time, arrival, latest))
+        All candidate markets (indices into problem.markets) are scored at once.
+        """
+        travel_times = self.problem.travel_matrix[self.problem.id_to_idx[current_id], candidates]
+        arrival = current_time + stay_duration + travel_times + self.problem.transfer_buffer
+        latest = latest_arrival[candidates]
         
-        if not valid_markets:
+        # Find valid markets first
+        valid = arrival <= latest
+        if not valid.any():
             return None
+        candidates, travel_times = candidates[valid], travel_times[valid]
+        arrival, latest = arrival[valid], latest[valid]
         
-        # Get max distance for normalization
-        max_dist = max(travel_time for _, travel_time, _, _ in valid_markets)
+        # Normalize distance by the max distance among valid markets
+        norm_dist = travel_times / max(travel_times.max(), 1)
         
-        for m, travel_time, arrival, latest in valid_markets:
-            # Normalize distance
-            norm_dist = travel_time / max(max_dist, 1)
-            
-            # Normalize time urgency
-            time_until_close = latest - arrival
-            
-            # Calculate max time among valid markets
-            time_windows = [latest2 - arrival for _, _, _, latest2 in valid_markets]
-            max_time = max(time_windows) if time_windows else 1
-            
-            norm_urgency = 1 - (time_until_close / max(max_time, 1))
-            
-            # Combined score
-            score = self.distance_weight * norm_dist + self.time_window_weight * norm_urgency
-            
-            if score < best_score:
-                best_score = score
-                best_market = m
+        # Normalize time urgency by the largest window still open on arrival
+        time_until_close = latest - arrival
+        max_time = latest.max() - arrival
+        norm_urgency = 1 - time_until_close / np.maximum(max_time, 1)
         
-        return best_market
-    
-    def _time_to_minutes(self, t: time) -> float:
-        """Convert time to minutes since midnight."""
-        return t.hour * 60 + t.minute
+        # Combined score
+        score = self.distance_weight * norm_dist + self.time_window_weight * norm_urgency
+        
+        return self.problem.markets[candidates[np.argmin(score)]]
     
     def _minutes_to_time(self, minutes: float) -> time:
         """Convert minutes since midnight to time."""
@@ -1,78 +1,247 @@
 """
 Visualization utilities for the Christmas Market optimizer.
 """
+import matplotlib
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
 import numpy as np
 from typing import List, Dict, Optional
-from datetime import time, datetime
+from datetime import time
 import os
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 from ..models.data_structures import Solution, ProblemInstance, MultiDaySolution
 
-# Optional imports for interactive maps
-try:
-    import folium
-    from folium import plugins
-    FOLIUM_AVAILABLE = True
-except ImportError:
-    FOLIUM_AVAILABLE = False
+# Optional dependency for interactive maps; only looked up here and imported by
+# the map methods, since loading folium is slow and most runs never need it
+FOLIUM_AVAILABLE = importlib.util.find_spec('folium') is not None
 
 
-# Set style
-sns.set_style("whitegrid")
+# Set style: seaborn's "whitegrid", set directly so importing this module doesn't pull in seaborn
+plt.rcParams.update({
+    'axes.grid': True,
+    'axes.axisbelow': True,
+    'axes.edgecolor': '.8',
+    'axes.labelcolor': '.15',
+    'grid.color': '.8',
+    'text.color': '.15',
+    'xtick.color': '.15',
+    'ytick.color': '.15',
+    'xtick.bottom': False,
+    'ytick.left': False,
+    'lines.solid_capstyle': 'round',
+    'patch.edgecolor': 'w',
+    'patch.force_edgecolor': True,
+    'font.sans-serif': ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Bitstream Vera Sans', 'sans-serif'],
+})
 plt.rcParams['figure.figsize'] = (12, 8)
 
 
+# Gantt x-axis: hourly ticks from 10:00 to 22:00, in minutes since midnight
+_GANTT_HOUR_TICK_POS = [h * 60 for h in range(10, 23)]
+_GANTT_HOUR_LABELS = [f"{h}:00" for h in range(10, 23)]
+
+# Legend proxies are only read by ax.legend, so one set can serve every chart
+_GANTT_LEGEND = [
+    Patch(facecolor='lightgray', edgecolor='black', label='Market Open Hours'),
+    Patch(facecolor='green', edgecolor='darkgreen', label='Visit Time'),
+    Patch(facecolor='orange', label='Travel Time')
+]
+
+# Viridis RGBA table, looked up directly instead of resolving the colormap per call
+_VIRIDIS_LUT = plt.cm.viridis(np.arange(plt.cm.viridis.N))
+
+
+# Shared style for the numbered stop pins, added once per folium map header
+_STOP_PIN_CSS = """<style>
+.stop-pin {
+    font-size: 14px; font-weight: bold; color: white;
+    text-shadow: 0 0 2px black;
+    border-radius: 50%; width: 25px; height: 25px;
+    display: flex; align-items: center; justify-content: center;
+    border: 2px solid white; box-sizing: border-box;
+}
+.stop-pin.day-pin { font-size: 12px; width: 30px; height: 30px; }
+</style>"""
+
+# Multi-day folium map HTML, filled with str.format; names go in pre-escaped (Market.name_html)
+_MULTI_DAY_POPUP_TEMPLATE = """<div style="font-family: Arial; min-width: 200px;">
+    <h4 style="margin:0; color: {color};">Day {day}, Stop {stop}</h4>
+    <h5 style="margin:5px 0;">{name}</h5>
+    <hr style="margin: 5px 0;">
+    <b>Arrival:</b> {arrival}<br>
+    <b>Departure:</b> {departure}<br>
+    <b>Stay:</b> {stay} min<br>
+    <b>Opening:</b> {opening} - {closing}
+</div>"""
+
+_MULTI_DAY_TITLE_TEMPLATE = """<div style="position: fixed; 
+            top: 10px; left: 50px; width: 450px; height: auto; 
+            background-color: white; border:2px solid grey; z-index:9999; 
+            font-size:14px; padding: 10px">
+<h4 style="margin:0;">Multi-Day Christmas Market Routes</h4>
+<p style="margin:5px 0;"><b>Days:</b> {days}</p>
+<p style="margin:5px 0;"><b>Total markets visited:</b> {visited}/{total}</p>
+<p style="margin:5px 0;"><b>Unvisited:</b> {unvisited}</p>
+</div>"""
+
+
+def _order_colors(n: int) -> np.ndarray:
+    """Viridis colors for `n` stops in visit order (same as viridis(linspace(0, 1, n)))."""
+    lut_size = len(_VIRIDIS_LUT)
+    return _VIRIDIS_LUT[np.minimum((np.linspace(0, 1, n) * lut_size).astype(np.intp), lut_size - 1)]
+
+
+def _hhmm(minutes: int) -> str:
+    """Format minutes since midnight as 'HH:MM', wrapping past midnight like datetime does."""
+    hours, mins = divmod(int(minutes) % (24 * 60), 60)
+    return f"{hours:02d}:{mins:02d}"
+
+
+def _hbar_collection(ys, lefts, widths, height, **kwargs) -> PolyCollection:
+    """Horizontal bars centered on `ys` as one PolyCollection (one artist, not one per bar)."""
+    ys, lefts, widths = np.broadcast_arrays(np.asarray(ys, dtype=float),
+                                           np.asarray(lefts, dtype=float),
+                                           np.asarray(widths, dtype=float))
+    bottom, top = ys - height / 2, ys + height / 2
+    right = lefts + widths
+    verts = np.stack([np.column_stack([lefts, bottom]), np.column_stack([lefts, top]),
+                      np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+    collection = PolyCollection(verts, **kwargs)
+    # Like barh, keep autoscaling margins from padding past the bars' left edges
+    collection.sticky_edges.x.extend(lefts.tolist())
+    return collection
+
+
 class Visualizer:
     """Visualization tool for solutions."""
     
-    def __init__(self, problem: ProblemInstance, output_dir: str = "results"):
+    def __init__(self, problem: ProblemInstance, output_dir: str = "results", dpi: int = 150,
+                 compress_level: int = 1, headless: bool = False, label_threshold: int = 150,
+                 reuse_figures: bool = False):
         """Initialize visualizer."""
         self.problem = problem
+        self.dpi = dpi  # resolution of saved raster figures
+        self.compress_level = compress_level  # zlib level for PNGs (0-9, matplotlib default 6)
+        self.headless = headless  # figures are only saved, never displayed (batch runs)
+        self.label_threshold = label_threshold  # max stops drawn as HTML pins on the multi-day map
+        # Headless only: recycle figures of the same layout, so a returned figure is
+        # cleared by the next plot of that shape. Only for callers that just save
+        self.reuse_figures = reuse_figures
+        self._fig_pool = {}  # (layout, figsize) -> (fig, axes)
+        self._markets_by_id = {m.id: m for m in problem.markets}
+        # (lon, lat) of every market, in `problem.markets` order
+        self._coords = np.array([(m.longitude, m.latitude) for m in problem.markets], dtype=np.float64)
+        # (lat, lon) for folium, rounded to 5 decimals (~1 m) to keep the map HTML small
+        self._map_coords = np.round(self._coords[:, ::-1], 5)
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
     
-    def plot_route_map(self, solution: Solution, save: bool = True, filename: str = "route_map.png"):
-        """Plot the route on a map with market locations."""
-        fig, ax = plt.subplots(figsize=(14, 10))
+    def _subplots(self, *args, **kwargs):
+        """plt.subplots, or a detached Agg figure when figures are never displayed.
+        
+        With `reuse_figures`, headless figures are reused by later calls with the
+        same layout and size: their axes are cleared rather than rebuilt, so a
+        returned figure is only valid until the next plot of the same shape.
+        """
+        if not self.headless:
+            return plt.subplots(*args, **kwargs)
+        
+        key = (args, tuple(sorted(kwargs.items())))
+        pooled = self._fig_pool.get(key) if self.reuse_figures else None
+        if pooled is not None:
+            fig, axes = pooled
+            for ax in np.atleast_1d(axes).flat:
+                ax.clear()
+            # Undo the previous tight_layout so the new one starts from the defaults
+            fig.subplots_adjust(**{name: matplotlib.rcParams[f'figure.subplot.{name}']
+                                   for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+            return fig, axes
+        
+        # Skips pyplot's figure manager; no plt.close needed
+        fig = Figure(figsize=kwargs.pop('figsize', None))
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(*args, **kwargs)
+        if self.reuse_figures:
+            self._fig_pool[key] = (fig, axes)
+        return fig, axes
+    
+    def _savefig(self, fig, filepath: str):
+        """Save a figure; PNGs and WebPs are written with cheap encoder settings.
+        
+        Pyplot figures are closed once saved so batch runs don't accumulate them.
+        """
+        kwargs = {}
+        if filepath.lower().endswith('.png'):
+            kwargs['pil_kwargs'] = {'compress_level': self.compress_level, 'optimize': False}
+        elif filepath.lower().endswith('.webp'):
+            # Fastest lossy WebP: encodes quicker than PNG and is about a third of the size
+            kwargs['pil_kwargs'] = {'method': 0}
+        fig.savefig(filepath, dpi=self.dpi, **kwargs)
+        if not self.headless:
+            plt.close(fig)
+    
+    def _route_indices(self, route: List[int]) -> np.ndarray:
+        """Positions of the route's market IDs in `problem.markets`."""
+        id_to_idx = self.problem.id_to_idx
+        return np.fromiter((id_to_idx[mid] for mid in route), dtype=np.intp, count=len(route))
+    
+    def plot_route_map(self, solution: Solution, save: bool = True, filename: str = "route_map.png",
+                       max_markers: int = 200, show_arrows: bool = False, fast: bool = False):
+        """Plot the route on a map with market locations.
+        
+        Routes longer than `max_markers` are drawn as small points joined by lines
+        colored in visit order, without per-stop colors, arrows or numbers. With `show_arrows`, direction
+        arrows are drawn on about 20 evenly spaced segments. `fast` drops the
+        numbers and arrows, and skips the layout pass unless the figure is saved
+        (for repeated calls with `save=False`, e.g. parameter sweeps).
+        """
+        fig, ax = self._subplots(figsize=(14, 10))
         
         # Plot all markets
-        all_lats = [m.latitude for m in self.problem.markets]
-        all_lons = [m.longitude for m in self.problem.markets]
-        
-        ax.scatter(all_lons, all_lats, c='lightgray', s=100, alpha=0.5, 
-                  label='Unvisited Markets', zorder=1)
+        ax.scatter(self._coords[:, 0], self._coords[:, 1], c='lightgray', s=100, alpha=0.5, 
+                  label='Unvisited Markets', zorder=1, rasterized=True)
         
         # Plot visited markets
         if solution.route:
-            visited_markets = [self.problem.get_market_by_id(mid) for mid in solution.route]
-            visited_lats = [m.latitude for m in visited_markets]
-            visited_lons = [m.longitude for m in visited_markets]
+            points = self._coords[self._route_indices(solution.route)]
+            detailed = len(points) <= max_markers
             
-            # Color by visit order
-            colors = plt.cm.viridis(np.linspace(0, 1, len(visited_markets)))
+            if detailed:
+                # Color by visit order
+                ax.scatter(points[:, 0], points[:, 1], c=_order_colors(len(points)), s=300, 
+                          edgecolors='black', linewidths=2, zorder=3, label='Visited Markets',
+                          rasterized=True)
+            else:
+                ax.scatter(points[:, 0], points[:, 1], c='blue', s=30, zorder=3,
+                          label='Visited Markets', rasterized=True)
             
-            ax.scatter(visited_lons, visited_lats, c=colors, s=300, 
-                      edgecolors='black', linewidths=2, zorder=3, label='Visited Markets')
+            # Plot route lines as one collection of (start, end) segments; without
+            # numbers, the segments carry the visit order as a viridis gradient
+            segments = np.stack([points[:-1], points[1:]], axis=1)
+            segment_colors = 'blue' if detailed else _order_colors(len(segments))
+            ax.add_collection(LineCollection(segments, colors=segment_colors, alpha=0.6,
+                                             linewidths=2, zorder=2, rasterized=True))
             
-            # Plot route lines
-            for i in range(len(visited_markets) - 1):
-                ax.plot([visited_lons[i], visited_lons[i+1]], 
-                       [visited_lats[i], visited_lats[i+1]],
-                       'b-', alpha=0.6, linewidth=2, zorder=2)
-                
-                # Add arrow
-                dx = visited_lons[i+1] - visited_lons[i]
-                dy = visited_lats[i+1] - visited_lats[i]
-                ax.arrow(visited_lons[i], visited_lats[i], dx*0.8, dy*0.8,
-                        head_width=0.001, head_length=0.001, fc='blue', 
-                        ec='blue', alpha=0.5, zorder=2)
+            # Add arrows on every stride-th segment, all in one quiver
+            if show_arrows and detailed and not fast and len(points) > 1:
+                stride = max(1, len(points) // 20)
+                starts = points[:-1:stride]
+                dx, dy = np.diff(points, axis=0)[::stride].T * 0.8
+                ax.quiver(starts[:, 0], starts[:, 1], dx, dy, angles='xy',
+                          scale_units='xy', scale=1, width=0.002, color='blue',
+                          alpha=0.5, zorder=2)
             
             # Add market numbers
-            for i, (lon, lat, market) in enumerate(zip(visited_lons, visited_lats, visited_markets)):
-                ax.annotate(f"{i+1}", (lon, lat), fontsize=10, fontweight='bold',
-                           ha='center', va='center', color='white', zorder=4)
+            for i, (lon, lat) in enumerate(points if detailed and not fast else []):
+                ax.text(lon, lat, str(i + 1), fontsize=10, fontweight='bold',
+                        ha='center', va='center', color='white', zorder=4)
         
         ax.set_xlabel('Longitude', fontsize=12)
         ax.set_ylabel('Latitude', fontsize=12)
@@ -81,61 +250,65 @@ class Visualizer:
         ax.legend(fontsize=10)
         ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        if save or not fast:
+            fig.tight_layout()
         
         if save:
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            self._savefig(fig, filepath)
             print(f"Saved route map to {filepath}")
         
         return fig, ax
     
-    def plot_gantt_chart(self, solution: Solution, save: bool = True, filename: str = "gantt.png"):
-        """Plot Gantt chart showing market visits over time."""
+    def plot_gantt_chart(self, solution: Solution, save: bool = True, filename: str = "gantt.png",
+                         max_markers: int = 50):
+        """Plot Gantt chart showing market visits over time.
+        
+        Routes longer than `max_markers` keep the figure height capped and drop
+        the per-row market names.
+        """
         if not solution.route:
             print("No route to visualize")
             return None, None
         
-        fig, ax = plt.subplots(figsize=(14, max(8, len(solution.route) * 0.5)))
+        num_rows = len(solution.route)
+        fig, ax = self._subplots(figsize=(14, max(8, min(num_rows, max_markers) * 0.5)))
         
         stay_duration = self.problem.stay_durations[solution.day - 1]
         
-        for i, (market_id, arrival_time) in enumerate(zip(solution.route, solution.arrival_times)):
-            market = self.problem.get_market_by_id(market_id)
-            
-            # Convert times to minutes
-            arrival_min = arrival_time.hour * 60 + arrival_time.minute
-            departure_min = arrival_min + stay_duration
-            
-            opening_min = market.opening_time.hour * 60 + market.opening_time.minute
-            closing_min = market.closing_time.hour * 60 + market.closing_time.minute
-            
-            # Plot market opening hours
-            ax.barh(i, closing_min - opening_min, left=opening_min, height=0.8,
-                   color='lightgray', alpha=0.5, edgecolor='black', linewidth=1)
-            
-            # Plot visit time
-            ax.barh(i, stay_duration, left=arrival_min, height=0.8,
-                   color='green', alpha=0.7, edgecolor='darkgreen', linewidth=2)
-            
-            # Add travel time if not first market
-            if i > 0:
-                prev_market_id = solution.route[i-1]
-                prev_arrival = solution.arrival_times[i-1]
-                prev_departure = prev_arrival.hour * 60 + prev_arrival.minute + stay_duration
-                
-                ax.barh(i, arrival_min - prev_departure, left=prev_departure, height=0.3,
-                       color='orange', alpha=0.6, label='Travel' if i == 1 else '')
+        # Times in minutes, gathered from the problem's per-market arrays
+        route_idx = self._route_indices(solution.route)
+        arrival_min = solution.arrival_min
+        opening_min = self.problem.opening_min[route_idx]
+        closing_min = self.problem.closing_min[route_idx]
+        ys = np.arange(num_rows)
+        
+        # Plot market opening hours
+        ax.add_collection(_hbar_collection(ys, opening_min, closing_min - opening_min, 0.8,
+                                           facecolor='lightgray', alpha=0.5,
+                                           edgecolor='black', linewidth=1, rasterized=True))
+        
+        # Plot visit time
+        ax.add_collection(_hbar_collection(ys, arrival_min, stay_duration, 0.8,
+                                           facecolor='green', alpha=0.7,
+                                           edgecolor='darkgreen', linewidth=2, rasterized=True))
+        
+        # Add travel time from the previous market's departure
+        prev_departure = arrival_min[:-1] + stay_duration
+        ax.add_collection(_hbar_collection(ys[1:], prev_departure, arrival_min[1:] - prev_departure,
+                                           0.3, facecolor='orange', alpha=0.6, rasterized=True))
+        ax.autoscale_view()
         
         # Set labels
-        market_names = [self.problem.get_market_by_id(mid).name for mid in solution.route]
-        ax.set_yticks(range(len(solution.route)))
-        ax.set_yticklabels([f"{i+1}. {name}" for i, name in enumerate(market_names)], fontsize=10)
+        if num_rows <= max_markers:
+            ax.set_yticks(range(num_rows))
+            names = self.problem.names
+            ax.set_yticklabels([f"{i+1}. {names[idx]}" for i, idx in enumerate(route_idx)],
+                               fontsize=10)
         
         # Format x-axis as time
-        hour_ticks = list(range(10, 23))
-        ax.set_xticks([h * 60 for h in hour_ticks])
-        ax.set_xticklabels([f"{h}:00" for h in hour_ticks])
+        ax.set_xticks(_GANTT_HOUR_TICK_POS)
+        ax.set_xticklabels(_GANTT_HOUR_LABELS)
         
         ax.set_xlabel('Time of Day', fontsize=12)
         ax.set_ylabel('Markets (in visit order)', fontsize=12)
@@ -143,19 +316,13 @@ class Visualizer:
         ax.grid(True, axis='x', alpha=0.3)
         
         # Add legend
-        from matplotlib.patches import Patch
-        legend_elements = [
-            Patch(facecolor='lightgray', edgecolor='black', label='Market Open Hours'),
-            Patch(facecolor='green', edgecolor='darkgreen', label='Visit Time'),
-            Patch(facecolor='orange', label='Travel Time')
-        ]
-        ax.legend(handles=legend_elements, loc='upper right', fontsize=10)
+        ax.legend(handles=_GANTT_LEGEND, loc='upper right', fontsize=10)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save:
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            self._savefig(fig, filepath)
             print(f"Saved Gantt chart to {filepath}")
         
         return fig, ax
@@ -163,7 +330,7 @@ class Visualizer:
     def plot_convergence(self, convergence_history: List[int], save: bool = True, 
                         filename: str = "convergence.png"):
         """Plot algorithm convergence."""
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = self._subplots(figsize=(12, 6))
         
         ax.plot(convergence_history, linewidth=2, color='blue')
         ax.fill_between(range(len(convergence_history)), convergence_history, 
@@ -175,19 +342,19 @@ class Visualizer:
         ax.grid(True, alpha=0.3)
         
         # Add best value annotation
-        best_val = max(convergence_history)
-        best_iter = convergence_history.index(best_val)
+        best_iter = int(np.argmax(convergence_history))
+        best_val = int(convergence_history[best_iter])
         ax.annotate(f'Best: {best_val} markets\n(iteration {best_iter})',
                    xy=(best_iter, best_val), xytext=(10, 10),
                    textcoords='offset points', fontsize=11,
                    bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save:
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            self._savefig(fig, filepath)
             print(f"Saved convergence plot to {filepath}")
         
         return fig, ax
@@ -195,17 +362,19 @@ class Visualizer:
     def plot_statistics(self, solution: Solution, save: bool = True, 
                        filename: str = "statistics.png"):
         """Plot solution statistics."""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
+        fig, ((ax1, ax2), (ax3, ax4)) = self._subplots(2, 2, figsize=(14, 10))
         
         if not solution.route:
             fig.suptitle("No feasible solution found", fontsize=16, fontweight='bold')
             return fig, (ax1, ax2, ax3, ax4)
         
+        route_idx = self._route_indices(solution.route)
+        
         # 1. Markets visited vs total
         visited = solution.total_markets_visited
         total = len(self.problem.markets)
         ax1.bar(['Visited', 'Unvisited'], [visited, total - visited], 
-               color=['green', 'red'], alpha=0.7)
+               color=['green', 'red'], alpha=0.7, rasterized=True)
         ax1.set_ylabel('Number of Markets', fontsize=11)
         ax1.set_title(f'Market Coverage: {visited}/{total} ({100*visited/total:.1f}%)', 
                      fontsize=12, fontweight='bold')
@@ -216,15 +385,24 @@ class Visualizer:
         total_stay = visited * stay_duration
         travel_time = solution.total_travel_time
         
-        ax2.pie([total_stay, travel_time], labels=['Visiting Markets', 'Traveling'],
-               autopct='%1.1f%%', colors=['green', 'orange'], startangle=90)
+        # One stacked bar instead of a pie: two rectangles rather than wedges and label layout
+        total_minutes = total_stay + travel_time
+        ax2.barh([0], [total_stay], height=0.5, color='green', rasterized=True)
+        ax2.barh([0], [travel_time], left=[total_stay], height=0.5, color='orange', rasterized=True)
+        for label, left, width in (('Visiting Markets', 0, total_stay),
+                                   ('Traveling', total_stay, travel_time)):
+            if width > 0:
+                ax2.text(left + width / 2, 0, f'{label}\n{100*width/total_minutes:.1f}%',
+                         ha='center', va='center', fontsize=11, fontweight='bold', color='white')
+        ax2.set_ylim(-0.5, 0.5)
+        ax2.set_yticks([])
+        ax2.set_xlabel('Minutes', fontsize=11)
         ax2.set_title(f'Time Distribution\nTotal: {solution.total_time:.0f} min', 
                      fontsize=12, fontweight='bold')
         
         # 3. Travel distances between consecutive markets
         if len(solution.route) > 1:
-            distances = [self.problem.get_travel_time(solution.route[i], solution.route[i+1])
-                        for i in range(len(solution.route) - 1)]
+            distances = self.problem.travel_matrix[route_idx[:-1], route_idx[1:]]
             ax3.plot(range(1, len(distances) + 1), distances, 'o-', linewidth=2, markersize=8)
             ax3.set_xlabel('Segment', fontsize=11)
             ax3.set_ylabel('Travel Time (min)', fontsize=11)
@@ -233,46 +411,96 @@ class Visualizer:
             ax3.grid(True, alpha=0.3)
         
         # 4. Market opening hours distribution
-        visited_markets = [self.problem.get_market_by_id(mid) for mid in solution.route]
-        opening_hours = [m.opening_time.hour + m.opening_time.minute/60 for m in visited_markets]
-        closing_hours = [m.closing_time.hour + m.closing_time.minute/60 for m in visited_markets]
+        opening_hours = self.problem.opening_min[route_idx] / 60
+        closing_hours = self.problem.closing_min[route_idx] / 60
         
-        x_pos = np.arange(len(visited_markets))
-        ax4.barh(x_pos, [c - o for o, c in zip(opening_hours, closing_hours)], 
-                left=opening_hours, alpha=0.7, color='skyblue')
+        x_pos = np.arange(len(route_idx))
+        ax4.barh(x_pos, closing_hours - opening_hours, 
+                left=opening_hours, alpha=0.7, color='skyblue', rasterized=True)
         ax4.set_yticks(x_pos)
-        ax4.set_yticklabels([f"M{i+1}" for i in range(len(visited_markets))], fontsize=9)
+        ax4.set_yticklabels([f"M{i+1}" for i in range(len(route_idx))], fontsize=9)
         ax4.set_xlabel('Hour of Day', fontsize=11)
         ax4.set_title('Market Opening Hours', fontsize=12, fontweight='bold')
         ax4.grid(True, axis='x', alpha=0.3)
         
         fig.suptitle(f'Solution Statistics - Day {solution.day}', fontsize=16, fontweight='bold')
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save:
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            self._savefig(fig, filepath)
             print(f"Saved statistics plot to {filepath}")
         
         return fig, (ax1, ax2, ax3, ax4)
     
+    def plot_all_days(self, multi_solution: MultiDaySolution, fmt: str = "png",
+                      parallel: bool = True, max_workers: Optional[int] = None):
+        """Save the route map, Gantt chart and statistics plot of every day.
+        
+        With `parallel`, days are rendered in worker processes, one day per task.
+        Files are named like the CLI's: day{N}_route_map.{fmt} etc.
+        """
+        settings = dict(dpi=self.dpi, compress_level=self.compress_level)
+        days = [day for day in multi_solution.daily_solutions if day.route]
+        
+        if not parallel or len(days) < 2:
+            for solution in days:
+                _save_day_plots(self.problem, self.output_dir, settings, solution, fmt)
+            return
+        
+        if max_workers is None:
+            max_workers = min(len(days), os.cpu_count() or 1)
+        # Fork would copy numba's threading layer (started by a parallel ACO run)
+        # into the workers, which then hang at exit; spawn starts them clean
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(_save_day_plots, self.problem, self.output_dir, settings,
+                                   solution, fmt)
+                       for solution in days]
+            for future in futures:
+                future.result()
+    
+    def generate_report(self, multi_solution: MultiDaySolution, filename: str = "report.pdf"):
+        """Save the multi-day overview and every day's plots as pages of one PDF.
+        
+        All pages go through a single PdfPages writer instead of one file per figure.
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        with PdfPages(filepath) as pdf:
+            def add_page(plot):
+                fig = plot[0]
+                pdf.savefig(fig, dpi=self.dpi)
+                if not self.headless:
+                    plt.close(fig)
+            
+            add_page(self.plot_multi_day_summary(multi_solution, save=False))
+            add_page(self.plot_multi_day_routes(multi_solution, save=False))
+            add_page(self.plot_multi_day_gantt(multi_solution, save=False))
+            for solution in multi_solution.daily_solutions:
+                if not solution.route:
+                    continue
+                add_page(self.plot_route_map(solution, save=False))
+                add_page(self.plot_gantt_chart(solution, save=False))
+                add_page(self.plot_statistics(solution, save=False))
+        print(f"Saved report to {filepath}")
+    
     def plot_multi_day_summary(self, multi_solution: MultiDaySolution, save: bool = True,
                               filename: str = "multi_day_summary.png"):
         """Plot summary of multi-day solution."""
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fig, (ax1, ax2) = self._subplots(1, 2, figsize=(14, 6))
         
         # Markets visited per day
         markets_per_day = [sol.total_markets_visited for sol in multi_solution.daily_solutions]
         days = [f"Day {sol.day}" for sol in multi_solution.daily_solutions]
         
-        ax1.bar(days, markets_per_day, color='steelblue', alpha=0.7, edgecolor='black')
+        bars = ax1.bar(days, markets_per_day, color='steelblue', alpha=0.7, edgecolor='black',
+                       rasterized=True)
         ax1.set_ylabel('Markets Visited', fontsize=12)
         ax1.set_title('Markets Visited Per Day', fontsize=13, fontweight='bold')
         ax1.grid(True, axis='y', alpha=0.3)
         
         # Add value labels
-        for i, v in enumerate(markets_per_day):
-            ax1.text(i, v + 0.1, str(v), ha='center', va='bottom', fontweight='bold')
+        ax1.bar_label(bars, fmt='%d', padding=3, fontweight='bold')
         
         # Cumulative progress
         cumulative = np.cumsum(markets_per_day)
@@ -295,51 +523,69 @@ class Visualizer:
                     f'({100*multi_solution.total_markets_visited/total_markets:.1f}%)',
                     fontsize=15, fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save:
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            self._savefig(fig, filepath)
             print(f"Saved multi-day summary to {filepath}")
         
         return fig, (ax1, ax2)
     
     def create_solution_report(self, solution: Solution):
         """Print text report of solution."""
-        print("\n" + "="*70)
-        print(f"SOLUTION REPORT - DAY {solution.day}")
-        print("="*70)
+        # Collected and printed in one write; the output is unchanged
+        lines = ["", "="*70, f"SOLUTION REPORT - DAY {solution.day}", "="*70]
         
         if not solution.is_feasible or not solution.route:
-            print("No feasible solution found!")
+            lines.append("No feasible solution found!")
+            print("\n".join(lines))
             return
         
-        print(f"\nMarkets Visited: {solution.total_markets_visited}/{len(self.problem.markets)}")
-        print(f"Total Travel Time: {solution.total_travel_time:.1f} minutes")
-        print(f"Total Time: {solution.total_time:.1f} minutes")
+        lines.append(f"\nMarkets Visited: {solution.total_markets_visited}/{len(self.problem.markets)}")
+        lines.append(f"Total Travel Time: {solution.total_travel_time:.1f} minutes")
+        lines.append(f"Total Time: {solution.total_time:.1f} minutes")
         
         stay_duration = self.problem.stay_durations[solution.day - 1]
+        departure_min = solution.arrival_min + stay_duration
+        
+        travel_times = self.problem.get_leg_travel_times(solution.route)
         
-        print(f"\nDetailed Route:")
-        print("-" * 70)
-        for i, (market_id, arrival) in enumerate(zip(solution.route, solution.arrival_times)):
-            market = self.problem.get_market_by_id(market_id)
-            departure_time = datetime.combine(datetime.today(), arrival) + \
-                           __import__('datetime').timedelta(minutes=stay_duration)
+        lines.append(f"\nDetailed Route:")
+        lines.append("-" * 70)
+        for i, market_id in enumerate(solution.route):
+            market = self._markets_by_id[market_id]
             
             travel_info = ""
             if i > 0:
-                prev_id = solution.route[i-1]
-                travel = self.problem.get_travel_time(prev_id, market_id)
-                travel_info = f" (travel: {travel:.0f} min)"
+                travel_info = f" (travel: {travel_times[i-1]:.0f} min)"
             
-            print(f"{i+1}. {market.name}")
-            print(f"   Arrive: {arrival.strftime('%H:%M')} | "
-                  f"Depart: {departure_time.strftime('%H:%M')} | "
-                  f"Open: {market.opening_time.strftime('%H:%M')}-{market.closing_time.strftime('%H:%M')}"
-                  f"{travel_info}")
+            lines.append(f"{i+1}. {market.name}")
+            lines.append(f"   Arrive: {_hhmm(solution.arrival_min[i])} | "
+                         f"Depart: {_hhmm(departure_min[i])} | "
+                         f"Open: {market.opening_str}-{market.closing_str}"
+                         f"{travel_info}")
+        
+        lines.append("="*70 + "\n")
+        print("\n".join(lines))
+    
+    def _add_unvisited_layer(self, folium_map, visited_ids: set):
+        """Add gray markers for markets not in `visited_ids`, as one layer attached once."""
+        import folium
         
-        print("="*70 + "\n")
+        layer = folium.FeatureGroup(name='Unvisited markets')
+        for market, location in zip(self.problem.markets, self._map_coords.tolist()):
+            if market.id not in visited_ids:
+                folium.CircleMarker(
+                    location=location,
+                    radius=5,
+                    popup=f"<b>{market.name_html}</b><br>Not visited",
+                    color='gray',
+                    fill=True,
+                    fillColor='lightgray',
+                    fillOpacity=0.4
+                ).add_to(layer)
+        layer.add_to(folium_map)
     
     def plot_interactive_map(self, solution: Solution, save: bool = True, 
                             filename: str = "interactive_map.html"):
@@ -348,6 +594,8 @@ class Visualizer:
             print("Folium not available. Install with: pip install folium")
             return None
         
+        import folium
+        
         # Get Vienna center
         vienna_center = [48.2082, 16.3738]
         
@@ -358,25 +606,17 @@ class Visualizer:
             tiles='OpenStreetMap'
         )
         
+        m.get_root().header.add_child(folium.Element(_STOP_PIN_CSS))
+        
         # Add all markets as gray markers
-        for market in self.problem.markets:
-            if market.id not in solution.route:
-                folium.CircleMarker(
-                    location=[market.latitude, market.longitude],
-                    radius=5,
-                    popup=f"<b>{market.name}</b><br>Not visited",
-                    color='gray',
-                    fill=True,
-                    fillColor='lightgray',
-                    fillOpacity=0.4
-                ).add_to(m)
+        self._add_unvisited_layer(m, set(solution.route))
         
         # Add visited markets with numbers and route
         if solution.route:
-            visited_markets = [self.problem.get_market_by_id(mid) for mid in solution.route]
+            visited_markets = [self._markets_by_id[mid] for mid in solution.route]
             
-            # Create route line
-            route_coords = [[m.latitude, m.longitude] for m in visited_markets]
+            # Create route line from the cached map coordinates
+            route_coords = self._map_coords[self._route_indices(solution.route)].tolist()
             folium.PolyLine(
                 route_coords,
                 color='blue',
@@ -386,11 +626,9 @@ class Visualizer:
             ).add_to(m)
             
             # Add markers for visited markets
-            for i, (market, arrival) in enumerate(zip(visited_markets, solution.arrival_times)):
-                stay_duration = self.problem.stay_durations[solution.day - 1]
-                departure = datetime.combine(datetime.today(), arrival) + \
-                           __import__('datetime').timedelta(minutes=stay_duration)
-                
+            stay_duration = self.problem.stay_durations[solution.day - 1]
+            departure_min = solution.arrival_min + stay_duration
+            for i, market in enumerate(visited_markets):
                 # Color gradient from green to red
                 color_idx = i / max(1, len(visited_markets) - 1)
                 colors = ['green', 'lightgreen', 'yellow', 'orange', 'red']
@@ -398,41 +636,25 @@ class Visualizer:
                 
                 popup_html = f"""
                 <div style="font-family: Arial; min-width: 200px;">
-                    <h4 style="margin:0; color: #333;">Stop {i+1}: {market.name}</h4>
+                    <h4 style="margin:0; color: #333;">Stop {i+1}: {market.name_html}</h4>
                     <hr style="margin: 5px 0;">
-                    <b>Arrival:</b> {arrival.strftime('%H:%M')}<br>
-                    <b>Departure:</b> {departure.strftime('%H:%M')}<br>
+                    <b>Arrival:</b> {_hhmm(solution.arrival_min[i])}<br>
+                    <b>Departure:</b> {_hhmm(departure_min[i])}<br>
                     <b>Stay:</b> {stay_duration} min<br>
-                    <b>Opening:</b> {market.opening_time.strftime('%H:%M')} - {market.closing_time.strftime('%H:%M')}
+                    <b>Opening:</b> {market.opening_str} - {market.closing_str}
                 </div>
                 """
                 
+                # One marker per stop: the numbered pin carries popup and tooltip
                 folium.Marker(
-                    location=[market.latitude, market.longitude],
+                    location=route_coords[i],
                     popup=folium.Popup(popup_html, max_width=300),
-                    icon=folium.Icon(color=color, icon='info-sign'),
+                    icon=folium.DivIcon(
+                        html=f'<div class="stop-pin" style="background-color: {color};">{i+1}</div>',
+                        icon_size=(25, 25), icon_anchor=(12, 12)
+                    ),
                     tooltip=f"Stop {i+1}: {market.name}"
                 ).add_to(m)
-                
-                # Add numbered labels
-                folium.Marker(
-                    location=[market.latitude, market.longitude],
-                    icon=folium.DivIcon(html=f"""
-                        <div style="
-                            font-size: 14px; 
-                            font-weight: bold; 
-                            color: white; 
-                            background-color: rgba(0,0,0,0.7);
-                            border-radius: 50%;
-                            width: 25px;
-                            height: 25px;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            border: 2px solid white;
-                        ">{i+1}</div>
-                    """)
-                ).add_to(m)
         
         # Add title
         title_html = f'''
@@ -455,45 +677,42 @@ class Visualizer:
         return m
     
     def plot_multi_day_routes(self, multi_solution: MultiDaySolution, save: bool = True,
-                             filename: str = "multi_day_routes.png"):
-        """Plot all routes on separate subplots for multi-day solution."""
+                             filename: str = "multi_day_routes.png", fast: bool = False):
+        """Plot all routes on separate subplots for multi-day solution.
+        
+        `fast` drops the stop numbers and skips the layout pass unless the figure is saved.
+        """
         num_days = len(multi_solution.daily_solutions)
-        fig, axes = plt.subplots(1, num_days, figsize=(7*num_days, 6))
+        fig, axes = self._subplots(1, num_days, figsize=(7*num_days, 6))
         
         if num_days == 1:
             axes = [axes]
         
-        # Plot all markets in background for each subplot
-        all_lats = [m.latitude for m in self.problem.markets]
-        all_lons = [m.longitude for m in self.problem.markets]
-        
         for day_idx, (ax, solution) in enumerate(zip(axes, multi_solution.daily_solutions)):
             # Background: all markets
-            ax.scatter(all_lons, all_lats, c='lightgray', s=100, alpha=0.3, 
-                      label='Unvisited', zorder=1)
+            ax.scatter(self._coords[:, 0], self._coords[:, 1], c='lightgray', s=100, alpha=0.3, 
+                      label='Unvisited', zorder=1, rasterized=True)
             
             # Plot this day's route
             if solution.route:
-                visited_markets = [self.problem.get_market_by_id(mid) for mid in solution.route]
-                visited_lats = [m.latitude for m in visited_markets]
-                visited_lons = [m.longitude for m in visited_markets]
+                points = self._coords[self._route_indices(solution.route)]
                 
                 # Color by visit order
-                colors = plt.cm.viridis(np.linspace(0, 1, len(visited_markets)))
+                colors = _order_colors(len(points))
                 
-                ax.scatter(visited_lons, visited_lats, c=colors, s=300, 
-                          edgecolors='black', linewidths=2, zorder=3, label='Visited')
+                ax.scatter(points[:, 0], points[:, 1], c=colors, s=300, 
+                          edgecolors='black', linewidths=2, zorder=3, label='Visited',
+                          rasterized=True)
                 
-                # Plot route lines
-                for i in range(len(visited_markets) - 1):
-                    ax.plot([visited_lons[i], visited_lons[i+1]], 
-                           [visited_lats[i], visited_lats[i+1]],
-                           'b-', alpha=0.6, linewidth=2, zorder=2)
+                # Plot route lines as one collection of (start, end) segments
+                segments = np.stack([points[:-1], points[1:]], axis=1)
+                ax.add_collection(LineCollection(segments, colors='blue', alpha=0.6,
+                                                 linewidths=2, zorder=2, rasterized=True))
                 
                 # Add market numbers
-                for i, (lon, lat) in enumerate(zip(visited_lons, visited_lats)):
-                    ax.annotate(f"{i+1}", (lon, lat), fontsize=9, fontweight='bold',
-                               ha='center', va='center', color='white', zorder=4)
+                for i, (lon, lat) in enumerate(points if not fast else []):
+                    ax.text(lon, lat, str(i + 1), fontsize=9, fontweight='bold',
+                            ha='center', va='center', color='white', zorder=4)
             
             ax.set_xlabel('Longitude', fontsize=10)
             ax.set_ylabel('Latitude', fontsize=10)
@@ -504,11 +723,12 @@ class Visualizer:
         fig.suptitle(f'Multi-Day Route Overview\n'
                     f'Total: {multi_solution.total_markets_visited}/{len(self.problem.markets)} markets',
                     fontsize=14, fontweight='bold')
-        plt.tight_layout()
+        if save or not fast:
+            fig.tight_layout()
         
         if save:
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            self._savefig(fig, filepath)
             print(f"Saved multi-day routes to {filepath}")
         
         return fig, axes
@@ -523,7 +743,7 @@ class Visualizer:
             print("No routes to visualize")
             return None, None
         
-        fig, ax = plt.subplots(figsize=(14, max(8, total_entries * 0.4)))
+        fig, ax = self._subplots(figsize=(14, max(8, total_entries * 0.4)))
         
         y_pos = 0
         yticks = []
@@ -538,46 +758,43 @@ class Visualizer:
             stay_duration = self.problem.stay_durations[solution.day - 1]
             day_color = colors_per_day[day_idx % len(colors_per_day)]
             
-            for i, (market_id, arrival_time) in enumerate(zip(solution.route, solution.arrival_times)):
-                market = self.problem.get_market_by_id(market_id)
-                
-                # Convert times to minutes
-                arrival_min = arrival_time.hour * 60 + arrival_time.minute
-                departure_min = arrival_min + stay_duration
-                
-                opening_min = market.opening_time.hour * 60 + market.opening_time.minute
-                closing_min = market.closing_time.hour * 60 + market.closing_time.minute
-                
-                # Plot market opening hours
-                ax.barh(y_pos, closing_min - opening_min, left=opening_min, height=0.8,
-                       color='lightgray', alpha=0.5, edgecolor='black', linewidth=1)
-                
-                # Plot visit time with day-specific color
-                ax.barh(y_pos, stay_duration, left=arrival_min, height=0.8,
-                       color=day_color, alpha=0.7, edgecolor='black', linewidth=2,
-                       label=f'Day {solution.day}' if i == 0 else '')
-                
-                # Add travel time if not first market
-                if i > 0:
-                    prev_market_id = solution.route[i-1]
-                    prev_arrival = solution.arrival_times[i-1]
-                    prev_departure = prev_arrival.hour * 60 + prev_arrival.minute + stay_duration
-                    
-                    ax.barh(y_pos, arrival_min - prev_departure, left=prev_departure, height=0.3,
-                           color='orange', alpha=0.6)
-                
-                yticks.append(y_pos)
-                ylabels.append(f"D{solution.day}.{i+1}: {market.name}")
-                y_pos += 1
+            # Times in minutes, gathered from the problem's per-market arrays
+            route_idx = self._route_indices(solution.route)
+            arrival_min = solution.arrival_min
+            opening_min = self.problem.opening_min[route_idx]
+            closing_min = self.problem.closing_min[route_idx]
+            ys = np.arange(y_pos, y_pos + len(route_idx))
+            
+            # Plot market opening hours
+            ax.add_collection(_hbar_collection(ys, opening_min, closing_min - opening_min, 0.8,
+                                               facecolor='lightgray', alpha=0.5,
+                                               edgecolor='black', linewidth=1, rasterized=True))
+            
+            # Plot visit time with day-specific color
+            ax.add_collection(_hbar_collection(ys, arrival_min, stay_duration, 0.8,
+                                               facecolor=day_color, alpha=0.7,
+                                               edgecolor='black', linewidth=2, rasterized=True,
+                                               label=f'Day {solution.day}'))
+            
+            # Add travel time from the previous market's departure
+            prev_departure = arrival_min[:-1] + stay_duration
+            ax.add_collection(_hbar_collection(ys[1:], prev_departure, arrival_min[1:] - prev_departure,
+                                               0.3, facecolor='orange', alpha=0.6, rasterized=True))
+            
+            yticks.extend(ys.tolist())
+            ylabels.extend(f"D{solution.day}.{i+1}: {self.problem.names[idx]}"
+                           for i, idx in enumerate(route_idx))
+            y_pos += len(route_idx)
+        
+        ax.autoscale_view()
         
         # Set labels
         ax.set_yticks(yticks)
         ax.set_yticklabels(ylabels, fontsize=9)
         
         # Format x-axis as time
-        hour_ticks = list(range(10, 23))
-        ax.set_xticks([h * 60 for h in hour_ticks])
-        ax.set_xticklabels([f"{h}:00" for h in hour_ticks])
+        ax.set_xticks(_GANTT_HOUR_TICK_POS)
+        ax.set_xticklabels(_GANTT_HOUR_LABELS)
         
         ax.set_xlabel('Time of Day', fontsize=12)
         ax.set_ylabel('Markets (by day and visit order)', fontsize=12)
@@ -588,31 +805,42 @@ class Visualizer:
         ax.grid(True, axis='x', alpha=0.3)
         ax.legend(loc='upper right', fontsize=10)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save:
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            self._savefig(fig, filepath)
             print(f"Saved multi-day Gantt chart to {filepath}")
         
         return fig, ax
     
     def plot_multi_day_interactive_map(self, multi_solution: MultiDaySolution, 
                                        save: bool = True,
-                                       filename: str = "multi_day_map.html"):
-        """Create interactive map showing all days with different colors."""
+                                       filename: str = "multi_day_map.html", labels: bool = True):
+        """Create interactive map showing all days with different colors.
+        
+        With `labels=False`, stops are drawn as filled circles on one canvas
+        instead of numbered HTML pins, which stays responsive for many stops.
+        Labels are also dropped when there are more than `label_threshold` stops.
+        """
         if not FOLIUM_AVAILABLE:
             print("Folium not available. Install with: pip install folium")
             return None
         
+        import folium
+        
         # Get Vienna center
         vienna_center = [48.2082, 16.3738]
         
+        total_stops = sum(len(sol.route) for sol in multi_solution.daily_solutions)
+        labels = labels and total_stops <= self.label_threshold
+        
         # Create map
         m = folium.Map(
             location=vienna_center,
             zoom_start=12,
-            tiles='OpenStreetMap'
+            tiles='OpenStreetMap',
+            prefer_canvas=not labels
         )
         
         # Track all visited markets
@@ -620,18 +848,10 @@ class Visualizer:
         for sol in multi_solution.daily_solutions:
             all_visited.update(sol.route)
         
+        m.get_root().header.add_child(folium.Element(_STOP_PIN_CSS))
+        
         # Add unvisited markets
-        for market in self.problem.markets:
-            if market.id not in all_visited:
-                folium.CircleMarker(
-                    location=[market.latitude, market.longitude],
-                    radius=5,
-                    popup=f"<b>{market.name}</b><br>Not visited",
-                    color='gray',
-                    fill=True,
-                    fillColor='lightgray',
-                    fillOpacity=0.4
-                ).add_to(m)
+        self._add_unvisited_layer(m, all_visited)
         
         # Colors for different days
         day_colors = ['blue', 'green', 'red', 'purple', 'orange']
@@ -641,76 +861,63 @@ class Visualizer:
             if not solution.route:
                 continue
             
-            visited_markets = [self.problem.get_market_by_id(mid) for mid in solution.route]
+            visited_markets = [self._markets_by_id[mid] for mid in solution.route]
             day_color = day_colors[day_idx % len(day_colors)]
             
-            # Create route line
-            route_coords = [[m.latitude, m.longitude] for m in visited_markets]
+            # The day's route and stops go into one layer, attached to the map once
+            day_layer = folium.FeatureGroup(name=f'Day {solution.day}')
+            
+            # Create route line from the cached map coordinates
+            route_coords = self._map_coords[self._route_indices(solution.route)].tolist()
             folium.PolyLine(
                 route_coords,
                 color=day_color,
                 weight=3,
                 opacity=0.7,
                 popup=f'Day {solution.day} Route'
-            ).add_to(m)
+            ).add_to(day_layer)
             
             # Add markers
             stay_duration = self.problem.stay_durations[solution.day - 1]
-            for i, (market, arrival) in enumerate(zip(visited_markets, solution.arrival_times)):
-                departure = datetime.combine(datetime.today(), arrival) + \
-                           __import__('datetime').timedelta(minutes=stay_duration)
-                
-                popup_html = f"""
-                <div style="font-family: Arial; min-width: 200px;">
-                    <h4 style="margin:0; color: {day_color};">Day {solution.day}, Stop {i+1}</h4>
-                    <h5 style="margin:5px 0;">{market.name}</h5>
-                    <hr style="margin: 5px 0;">
-                    <b>Arrival:</b> {arrival.strftime('%H:%M')}<br>
-                    <b>Departure:</b> {departure.strftime('%H:%M')}<br>
-                    <b>Stay:</b> {stay_duration} min<br>
-                    <b>Opening:</b> {market.opening_time.strftime('%H:%M')} - {market.closing_time.strftime('%H:%M')}
-                </div>
-                """
+            departure_min = solution.arrival_min + stay_duration
+            for i, market in enumerate(visited_markets):
+                popup_html = _MULTI_DAY_POPUP_TEMPLATE.format(
+                    color=day_color, day=solution.day, stop=i + 1, name=market.name_html,
+                    arrival=_hhmm(solution.arrival_min[i]), departure=_hhmm(departure_min[i]),
+                    stay=stay_duration, opening=market.opening_str, closing=market.closing_str
+                )
                 
-                folium.Marker(
-                    location=[market.latitude, market.longitude],
-                    popup=folium.Popup(popup_html, max_width=300),
-                    icon=folium.Icon(color=day_color, icon='info-sign'),
-                    tooltip=f"Day {solution.day}, Stop {i+1}"
-                ).add_to(m)
-                
-                # Add label
-                folium.Marker(
-                    location=[market.latitude, market.longitude],
-                    icon=folium.DivIcon(html=f"""
-                        <div style="
-                            font-size: 12px; 
-                            font-weight: bold; 
-                            color: white; 
-                            background-color: {day_color};
-                            border-radius: 50%;
-                            width: 30px;
-                            height: 30px;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            border: 2px solid white;
-                        ">D{solution.day}.{i+1}</div>
-                    """)
-                ).add_to(m)
+                if labels:
+                    folium.Marker(
+                        location=route_coords[i],
+                        popup=folium.Popup(popup_html, max_width=300),
+                        icon=folium.DivIcon(
+                            html=f'<div class="stop-pin day-pin" style="background-color: {day_color};">'
+                                 f'D{solution.day}.{i+1}</div>',
+                            icon_size=(30, 30), icon_anchor=(15, 15)
+                        ),
+                        tooltip=f"Day {solution.day}, Stop {i+1}"
+                    ).add_to(day_layer)
+                else:
+                    folium.CircleMarker(
+                        location=route_coords[i],
+                        radius=8,
+                        popup=folium.Popup(popup_html, max_width=300),
+                        color='white',
+                        weight=2,
+                        fill=True,
+                        fillColor=day_color,
+                        fillOpacity=1.0,
+                        tooltip=f"Day {solution.day}, Stop {i+1}"
+                    ).add_to(day_layer)
+            
+            day_layer.add_to(m)
         
         # Add title
-        title_html = f'''
-        <div style="position: fixed; 
-                    top: 10px; left: 50px; width: 450px; height: auto; 
-                    background-color: white; border:2px solid grey; z-index:9999; 
-                    font-size:14px; padding: 10px">
-        <h4 style="margin:0;">Multi-Day Christmas Market Routes</h4>
-        <p style="margin:5px 0;"><b>Days:</b> {len(multi_solution.daily_solutions)}</p>
-        <p style="margin:5px 0;"><b>Total markets visited:</b> {multi_solution.total_markets_visited}/{len(self.problem.markets)}</p>
-        <p style="margin:5px 0;"><b>Unvisited:</b> {len(multi_solution.unvisited_markets)}</p>
-        </div>
-        '''
+        title_html = _MULTI_DAY_TITLE_TEMPLATE.format(
+            days=len(multi_solution.daily_solutions), visited=multi_solution.total_markets_visited,
+            total=len(self.problem.markets), unvisited=len(multi_solution.unvisited_markets)
+        )
         m.get_root().html.add_child(folium.Element(title_html))
         
         if save:
@@ -719,3 +926,12 @@ class Visualizer:
             print(f"Saved multi-day interactive map to {filepath}")
         
         return m
+
+
+def _save_day_plots(problem: ProblemInstance, output_dir: str, settings: dict,
+                    solution: Solution, fmt: str):
+    """Worker for Visualizer.plot_all_days; module level so it can be pickled."""
+    visualizer = Visualizer(problem, output_dir, headless=True, reuse_figures=True, **settings)
+    visualizer.plot_route_map(solution, filename=f"day{solution.day}_route_map.{fmt}")
+    visualizer.plot_gantt_chart(solution, filename=f"day{solution.day}_gantt.{fmt}")
+    visualizer.plot_statistics(solution, filename=f"day{solution.day}_statistics.{fmt}")
@@ -0,0 +1,138 @@
+"""
+Tests for the ACO optimizer
+"""
+import sys
+import os
+import subprocess
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from datetime import time
+from src.models.data_structures import Market, ProblemInstance, Solution
+from src.models.aco import AntColonyOptimizer, _roulette_select
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def _make_problem(num_markets=8):
+    """Markets on a line, 10 min apart per step, open 10:00-14:00."""
+    markets = [
+        Market(i, f"M{i}", 48.2 + 0.01 * i, 16.3 + 0.01 * i, time(10, 0), time(14, 0))
+        for i in range(1, num_markets + 1)
+    ]
+    travel_times = {(a.id, b.id): 10.0 * abs(a.id - b.id)
+                    for a in markets for b in markets if a.id != b.id}
+    return ProblemInstance(markets=markets, travel_times=travel_times,
+                           num_days=2, stay_durations=[30, 30])
+
+
+def _solve_keeps_global_rng(numba_blocked):
+    """Solve in a subprocess and report whether np.random's state was left alone."""
+    code = (
+        "import sys\n"
+        + ("sys.modules['numba'] = None\n" if numba_blocked else "")
+        + "sys.path.insert(0, '.')\n"
+        "import numpy as np\n"
+        "from tests.test_aco import _make_problem\n"
+        "from src.models.aco import AntColonyOptimizer, NUMBA_AVAILABLE\n"
+        "aco = AntColonyOptimizer(_make_problem(), num_ants=5, num_iterations=3)\n"
+        "before = np.random.get_state()[1].copy()\n"
+        "route = aco.solve(day=1).route\n"
+        "print(NUMBA_AVAILABLE, np.array_equal(before, np.random.get_state()[1]))\n"
+        "print(route)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    flags, route = result.stdout.splitlines()[-2:]
+    numba_available, unchanged = flags.split()
+    return numba_available == "True", unchanged == "True", route
+
+
+def test_fallback_leaves_global_rng_alone():
+    """Test that the NumPy fallback draws from a private generator"""
+    numba_available, unchanged, route = _solve_keeps_global_rng(numba_blocked=True)
+    assert not numba_available
+    assert unchanged
+    # Same Mersenne Twister stream as the compiled kernels, so the same routes
+    assert route == _solve_keeps_global_rng(numba_blocked=False)[2]
+
+
+def test_fallback_warns_once():
+    """Test that importing the optimizer without numba logs one warning"""
+    code = ("import sys\n"
+            "sys.modules['numba'] = None\n"
+            "sys.path.insert(0, '.')\n"
+            "import src.models.aco\n"
+            "import src.models.greedy, src.models.aco\n")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stderr.count("numba is not installed") == 1
+
+
+def test_roulette_select_edge_cases():
+    """Test that zero weights are never picked and all-zero weights give -1"""
+    assert _roulette_select(np.zeros(4)) == -1
+    picks = {int(_roulette_select(np.array([0.0, 2.0, 0.0, 1.0, 0.0]))) for _ in range(500)}
+    assert picks == {1, 3}
+    assert all(_roulette_select(np.array([0.0, 0.0, 5.0])) == 2 for _ in range(50))
+    assert all(_roulette_select(np.array([1e-300, 0.0])) == 0 for _ in range(50))
+
+
+def test_pheromone_update_matches_per_edge_deposits():
+    """Test the bincount deposit against adding every edge one at a time"""
+    problem = _make_problem(6)
+    n = len(problem.markets)
+    aco = AntColonyOptimizer(problem, num_ants=3, num_iterations=1)
+    aco.pheromones = np.random.RandomState(0).uniform(0.5, 2.0, (n, n)).astype(np.float32)
+    
+    # Ants 0 and 1 share the edge 0 -> 1 with each other and with the elite route;
+    # ant 2 visited one market only, so it deposits nothing
+    routes = np.array([[0, 1, 2, -1, -1, -1],
+                       [3, 0, 1, 5, -1, -1],
+                       [4, -1, -1, -1, -1, -1]])
+    lengths = np.array([3, 4, 1])
+    elite = np.array([0, 1, 4])
+    aco._best_route_idx = elite
+    aco.best_solution = Solution(route=[1, 2, 5], arrival_times=[], total_markets_visited=3,
+                                 total_travel_time=0.0, total_time=0.0, is_feasible=True)
+    
+    expected = aco.pheromones.astype(np.float64) * (1 - aco.evaporation)
+    for route, length in zip(routes, lengths):
+        for i in range(length - 1):
+            np.add.at(expected, (route[i], route[i + 1]), aco.Q * length / n)
+    for i in range(len(elite) - 1):
+        np.add.at(expected, (elite[i], elite[i + 1]), aco.Q * 3 * aco.elite_weight / n)
+    
+    aco._update_pheromones(routes, lengths)
+    assert np.allclose(aco.pheromones, expected, rtol=1e-6)
+
+
+def test_solve_is_feasible_and_reproducible():
+    """Test that routes respect time windows and exclusions and repeat for a seed"""
+    problem = _make_problem()
+    stay = problem.stay_durations[0]
+    
+    solution = AntColonyOptimizer(problem, num_ants=10, num_iterations=5, random_seed=7).solve(
+        day=1, excluded_markets=[1])
+    again = AntColonyOptimizer(problem, num_ants=10, num_iterations=5, random_seed=7).solve(
+        day=1, excluded_markets=[1])
+    assert solution.route == again.route
+    
+    assert solution.route and 1 not in solution.route
+    assert len(set(solution.route)) == len(solution.route)
+    arrivals = [t.hour * 60 + t.minute for t in solution.arrival_times]
+    for market_id, arrival in zip(solution.route, arrivals):
+        market = problem.get_market_by_id(market_id)
+        assert market.opening_min <= arrival <= market.closing_min - stay
+    for k in range(len(arrivals) - 1):
+        travel = problem.get_travel_time(solution.route[k], solution.route[k + 1])
+        assert arrivals[k + 1] >= arrivals[k] + stay + travel + problem.transfer_buffer
+
+
+if __name__ == "__main__":
+    test_fallback_leaves_global_rng_alone()
+    test_fallback_warns_once()
+    test_roulette_select_edge_cases()
+    test_pheromone_update_matches_per_edge_deposits()
+    test_solve_is_feasible_and_reproducible()
+    print("✓ All ACO tests passed!")
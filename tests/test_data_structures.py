@@ -3,10 +3,14 @@ Basic tests for data structures
 """
 import sys
 import os
+import json
+import tempfile
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from datetime import time
-from src.models.data_structures import Market, Solution, ProblemInstance
+import numpy as np
+from src.models.data_structures import Market, Solution, ProblemInstance, load_problem_instance
+from modules.travel_times import load_travel_times, save_travel_times_npy
 
 
 def test_market_creation():
@@ -25,6 +29,11 @@ def test_market_creation():
     assert market.name == "Test Market"
     assert market.is_open_at(time(15, 0)) == True
     assert market.is_open_at(time(9, 0)) == False
+    assert market.is_open_at_min(22 * 60) == True
+    assert market.is_open_at_min(9 * 60) == False
+    assert market.opening_str == "10:00"
+    assert market.closing_str == "22:00"
+    assert Market(2, "Kunst & Genuss", 48.2, 16.3, time(10, 0), time(20, 0)).name_html == "Kunst &amp; Genuss"
 
 
 def test_market_latest_arrival():
@@ -40,6 +49,7 @@ def test_market_latest_arrival():
     
     latest = market.latest_arrival_time(30)  # 30 min stay
     assert latest == time(19, 30)
+    assert market.latest_arrival_min(30) == 19 * 60 + 30
 
 
 def test_solution_creation():
@@ -57,6 +67,7 @@ def test_solution_creation():
     assert len(solution.route) == 3
     assert solution.total_markets_visited == 3
     assert solution.is_feasible == True
+    assert list(solution.arrival_min) == [600, 660, 720]
 
 
 def test_problem_instance():
@@ -84,9 +95,73 @@ def test_problem_instance():
     assert problem.get_latest_closing() == time(21, 0)
 
 
+def test_problem_instance_dense_lookups():
+    """Test precomputed index, travel matrix and minute arrays"""
+    markets = [
+        Market(1, "M1", 48.2, 16.3, time(10, 0), time(20, 0)),
+        Market(2, "M2", 48.3, 16.4, time(11, 30), time(21, 0)),
+        Market(3, "M3", 48.4, 16.5, time(12, 0), time(22, 0))
+    ]
+    
+    problem = ProblemInstance(
+        markets=markets,
+        travel_times={(1, 2): 15.0, (2, 3): 10.0, (3, 2): 12.0},
+        num_days=1,
+        stay_durations=[30]
+    )
+    
+    assert problem.id_to_idx == {1: 0, 2: 1, 3: 2}
+    assert list(problem.ids) == [1, 2, 3]
+    assert problem.names == ["M1", "M2", "M3"]
+    assert problem.get_travel_time(2, 1) == 15.0  # falls back to reverse direction
+    assert problem.get_travel_time(3, 2) == 12.0
+    assert problem.get_travel_time(1, 3) == float('inf')
+    assert problem.get_travel_time(2, 2) == 0.0
+    assert list(problem.get_leg_travel_times([1, 2, 3])) == [15.0, 10.0]
+    assert problem.get_leg_travel_times([1]).size == 0
+    # Unknown market IDs have no travel time instead of raising
+    assert problem.get_travel_time(1, 99) == float('inf')
+    assert problem.get_travel_time(99, 1) == float('inf')
+    assert problem.get_travel_time(99, 99) == 0.0
+    assert list(problem.get_leg_travel_times([1, 99, 2, 3])) == [float('inf'), float('inf'), 10.0]
+    assert list(problem.opening_min) == [600, 690, 720]
+    assert list(problem.closing_min) == [1200, 1260, 1320]
+    assert problem.get_market_by_id(3).name == "M3"
+    assert problem.get_market_by_id(99) is None
+
+
+def test_load_problem_instance_npy():
+    """Test loading travel times from a .npy matrix instead of the JSON"""
+    data_dir = tempfile.mkdtemp()
+    markets_path = os.path.join(data_dir, "markets.json")
+    travel_times_path = os.path.join(data_dir, "travel_times.json")
+    with open(markets_path, 'w') as f:
+        json.dump([
+            {"id": 1, "name": "M1", "latitude": 48.2, "longitude": 16.3,
+             "opening_time": "10:00", "closing_time": "20:00"},
+            {"id": 2, "name": "M2", "latitude": 48.3, "longitude": 16.4,
+             "opening_time": "11:00", "closing_time": "21:00"}
+        ], f)
+    with open(travel_times_path, 'w') as f:
+        json.dump({"times": {"1": {"2": 15.3}, "2": {"1": 16.7}}}, f)
+    
+    from_json = load_problem_instance(markets_path, travel_times_path)
+    assert from_json.travel_times == {(1, 2): 15.3, (2, 1): 16.7}
+    
+    # Written by the data pipeline's own writer, so the two formats stay in step
+    npy_path = os.path.join(data_dir, "travel_times.npy")
+    save_travel_times_npy(load_travel_times(travel_times_path), npy_path)
+    
+    from_npy = load_problem_instance(markets_path, travel_times_path,
+                                     travel_times_npy_path=npy_path)
+    assert from_npy.travel_times == from_json.travel_times
+    assert np.array_equal(from_npy.travel_matrix, from_json.travel_matrix)
+
 if __name__ == "__main__":
     test_market_creation()
     test_market_latest_arrival()
     test_solution_creation()
     test_problem_instance()
+    test_problem_instance_dense_lookups()
+    test_load_problem_instance_npy()
     print("✓ All basic tests passed!")
@@ -0,0 +1,82 @@
+"""
+Tests for the greedy optimizer
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from src.models.data_structures import load_problem_instance
+from src.models.greedy import GreedyOptimizer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+HEURISTICS = ["nearest", "earliest_closing", "time_efficient", "hybrid"]
+
+# Routes of days 1 and 2 from the original list-based implementation
+ORIGINAL_ROUTES = {
+    ("demo", "nearest"): [[1, 7, 8, 3, 5, 9, 10, 4, 11, 12, 6, 2], []],
+    ("demo", "earliest_closing"): [[2, 5, 9, 12, 4, 6, 8, 10, 1, 3, 7, 11], []],
+    ("demo", "time_efficient"): [[1, 7, 8, 3, 10, 4, 9, 5, 6, 2, 11, 12], []],
+    ("demo", "hybrid"): [[2, 10, 3, 7, 1, 8, 11, 4, 6, 9, 5, 12], []],
+    ("real", "nearest"): [[19, 28, 6, 8, 20, 22, 5, 3, 15, 14, 16, 2, 31, 7, 10, 1],
+                          [9, 25, 18, 13, 4, 23, 24, 30, 12, 11]],
+    ("real", "earliest_closing"): [[3, 15, 12, 20, 21, 22, 23, 24, 29, 32, 26, 1, 2],
+                                   [4, 28, 30, 5, 6, 8, 10, 11, 14, 16]],
+    ("real", "time_efficient"): [[3, 14, 15, 20, 22, 5, 6, 8, 4, 23, 24, 1, 18, 13, 2, 31],
+                                 [9, 25, 16, 11, 12, 28, 19, 26, 27, 7]],
+    ("real", "hybrid"): [[3, 14, 2, 1, 18, 13, 16, 31, 7, 9, 19],
+                         [23, 4, 8, 6, 5, 26, 11, 28, 25, 10]],
+}
+
+
+def _load(data):
+    return load_problem_instance(
+        os.path.join(DATA_DIR, data, "markets.json"),
+        os.path.join(DATA_DIR, data, "travel_times.json"),
+        num_days=2,
+        stay_durations=[30, 45]
+    )
+
+
+def test_routes_unchanged():
+    """Test that every heuristic still finds the original implementation's routes"""
+    for data in ("demo", "real"):
+        problem = _load(data)
+        for heuristic in HEURISTICS:
+            excluded = []
+            routes = []
+            for day in (1, 2):
+                solution = GreedyOptimizer(problem, heuristic=heuristic).solve(
+                    day=day, excluded_markets=excluded)
+                excluded += list(solution.route)
+                routes.append(list(solution.route))
+            assert routes == ORIGINAL_ROUTES[(data, heuristic)], (data, heuristic)
+
+
+def test_start_pruning_keeps_best_route():
+    """Test that skipping dominated starts returns the best route over all starts"""
+    problem = _load("real")
+    for heuristic in HEURISTICS:
+        for day, excluded in ((1, []), (2, [3, 14, 15, 20, 22])):
+            optimizer = GreedyOptimizer(problem, heuristic=heuristic)
+            solution = optimizer.solve(day=day, excluded_markets=excluded)
+            
+            stay_duration = problem.stay_durations[day - 1]
+            excluded_mask = np.isin(problem.ids, excluded)
+            latest_arrival = problem.closing_min - stay_duration
+            best = None
+            for market in problem.markets:
+                if market.id in excluded:
+                    continue
+                candidate = optimizer._construct_solution(market, stay_duration,
+                                                          excluded_mask, latest_arrival)
+                if best is None or candidate.total_markets_visited > best.total_markets_visited:
+                    best = candidate
+            assert solution.route == best.route, (heuristic, day)
+
+
+if __name__ == "__main__":
+    test_routes_unchanged()
+    test_start_pruning_keeps_best_route()
+    print("✓ All greedy tests passed!")
@@ -0,0 +1,188 @@
+"""
+Tests for building the travel time matrix
+"""
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules import travel_times
+from modules.cache import DiskCache
+from modules.market_data import Market
+from modules.rate_limiter import ElementRateLimiter
+
+
+class FakeClient:
+    """Distance Matrix stand-in: 1 minute per 0.01 degrees of latitude.
+    
+    Pairs listed in `no_route` come back as ZERO_RESULTS. With `uphill`,
+    trips to a lower latitude take half a minute longer.
+    """
+    
+    def __init__(self, no_route=(), uphill=0.0):
+        self.no_route = set(no_route)
+        self.uphill = uphill
+        self.requests = []
+    
+    def distance_matrix(self, origins, destinations, mode, departure_time):
+        self.requests.append((origins, destinations))
+        rows = []
+        for o in origins:
+            elements = []
+            for d in destinations:
+                if (o, d) in self.no_route:
+                    elements.append({"status": "ZERO_RESULTS"})
+                else:
+                    minutes = abs(o[0] - d[0]) * 100 + (self.uphill if d[0] < o[0] else 0.0)
+                    elements.append({"status": "OK", "duration": {"value": minutes * 60}})
+            rows.append({"elements": elements})
+        return {"rows": rows}
+
+
+def _make_markets(num_markets):
+    return [Market(i, f"M{i}", "10:00", "20:00", lat=round(48.0 + 0.01 * i, 2), lon=16.0)
+            for i in range(1, num_markets + 1)]
+
+
+def _build(markets, client, **kwargs):
+    """Run build_travel_time_matrix against `client` instead of Google Maps."""
+    get_client = travel_times.get_client
+    travel_times.get_client = lambda: client
+    try:
+        return travel_times.build_travel_time_matrix(markets, max_workers=2, **kwargs)
+    finally:
+        travel_times.get_client = get_client
+
+
+def test_chunks():
+    """Test splitting markets into request batches"""
+    assert travel_times._chunks(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+    assert travel_times._chunks([], 10) == []
+
+
+def test_parse_rows():
+    """Test turning Distance Matrix rows into travel times"""
+    markets = _make_markets(2)
+    rows = [
+        {"elements": [{"status": "OK", "duration": {"value": 0}},
+                      {"status": "OK", "duration": {"value": 754}}]},
+        {"elements": [{"status": "ZERO_RESULTS"},
+                      {"status": "OK", "duration": {"value": 0}}]},
+    ]
+    times = travel_times._parse_rows(rows, markets, markets)
+    assert set(times) == {("1", "2"), ("2", "1")}  # no self pairs
+    assert times[("1", "2")] == 12.6
+    assert times[("2", "1")] is travel_times.NO_ROUTE
+    # A rejected request leaves every pair unknown
+    assert travel_times._parse_rows(None, markets, markets) == {("1", "2"): None, ("2", "1"): None}
+
+
+def test_build_matrix():
+    """Test the batched requests and the resulting nested dict"""
+    markets = _make_markets(12) + [Market(13, "No coordinates", "10:00", "20:00")]
+    client = FakeClient(uphill=0.5)
+    matrix = _build(markets, client)
+    
+    # 12 located markets in batches of 10: 2 x 2 blocks
+    assert len(client.requests) == 4
+    assert max(len(o) * len(d) for o, d in client.requests) <= 100
+    times = matrix["times"]
+    assert set(times) == {m.id for m in markets}
+    assert all(len(destinations) == len(markets) - 1 for destinations in times.values())
+    assert times["1"]["12"] == 11.0
+    assert times["12"]["1"] == 11.5
+    assert times["1"]["13"] is None and times["13"]["1"] is None
+
+
+def test_symmetric_mirrors_skipped_blocks():
+    """Test that symmetric mode requests the upper triangle of blocks only"""
+    markets = _make_markets(12)
+    client = FakeClient(uphill=0.5)
+    times = _build(markets, client, symmetric=True)["times"]
+    
+    assert len(client.requests) == 3
+    # Both directions inside a requested block keep their own times...
+    assert times["1"]["2"] == 1.0
+    assert times["2"]["1"] == 1.5
+    # ...while the skipped block (rows 11-12, columns 1-10) is mirrored
+    assert times["1"]["12"] == 11.0
+    assert times["12"]["1"] == 11.0
+
+
+def test_max_travel_time_prunes_unreachable_pairs():
+    """Test that pairs too far apart for `max_travel_time` are never requested"""
+    markets = _make_markets(3) + [Market(4, "Far", "10:00", "20:00", lat=49.0, lon=16.0)]
+    client = FakeClient()
+    times = _build(markets, client, max_travel_time=30)["times"]
+    
+    requested = {location for o, d in client.requests for location in o + d}
+    assert (49.0, 16.0) not in requested
+    assert times["1"]["3"] == 2.0
+    assert all(times["4"][m.id] is None and times[m.id]["4"] is None for m in markets[:3])
+
+
+def test_rate_limiter():
+    """Test the element token bucket"""
+    limiter = ElementRateLimiter(capacity=100, refill_rate=1000.0)
+    assert limiter._reserve(100) == 0.0
+    wait = limiter._reserve(50)
+    assert 0 < wait <= 0.05  # nothing was taken for the denied request
+    
+    start = time.monotonic()
+    limiter.acquire(50)
+    assert time.monotonic() - start >= 0.04
+    
+    # Requests larger than the bucket are clamped so they can still go through
+    assert ElementRateLimiter(capacity=100, refill_rate=1000.0)._reserve(500) == 0.0
+
+
+def test_disk_cache_expiry():
+    """Test expiring, refreshing and persisting cache entries"""
+    cache_path = os.path.join(tempfile.mkdtemp(), "gmaps")
+    with DiskCache(path=cache_path) as cache:
+        cache.set("fresh", 1.0, expire=60)
+        cache.set("stale", 2.0, expire=-1)
+        cache.set("forever", 3.0)
+        assert cache.get("fresh") == 1.0
+        assert cache.get("stale") is None
+        assert cache.get("stale", "default") == "default"
+        assert cache.get("missing") is None
+    
+    with DiskCache(path=cache_path, refresh=True) as cache:
+        assert cache.get("forever") is None
+    
+    with DiskCache(path=cache_path) as cache:
+        assert cache.get("forever") == 3.0
+
+
+def test_cache_keeps_no_route_pairs():
+    """Test that a rerun sends no requests, even for blocks with a no-route pair"""
+    markets = _make_markets(3)
+    no_route = {((48.01, 16.0), (48.03, 16.0))}
+    cache_path = os.path.join(tempfile.mkdtemp(), "gmaps")
+    
+    with DiskCache(path=cache_path) as cache:
+        first_client = FakeClient(no_route)
+        first = _build(markets, first_client, cache=cache)
+    assert len(first_client.requests) == 1
+    assert first["times"]["1"]["3"] is None
+    assert first["times"]["1"]["2"] == 1.0
+    
+    with DiskCache(path=cache_path) as cache:
+        second_client = FakeClient(no_route)
+        second = _build(markets, second_client, cache=cache)
+    assert second_client.requests == []
+    assert second == first
+
+
+if __name__ == "__main__":
+    test_chunks()
+    test_parse_rows()
+    test_build_matrix()
+    test_symmetric_mirrors_skipped_blocks()
+    test_max_travel_time_prunes_unreachable_pairs()
+    test_rate_limiter()
+    test_disk_cache_expiry()
+    test_cache_keeps_no_route_pairs()
+    print("✓ All travel time tests passed!")
@@ -0,0 +1,81 @@
+"""
+Tests for saving plots
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import matplotlib
+matplotlib.use('Agg')
+
+from datetime import time
+from src.models.data_structures import Market, MultiDaySolution, ProblemInstance
+from src.models.aco import AntColonyOptimizer
+from src.visualization.plotter import Visualizer
+
+
+def test_plot_all_days_after_aco():
+    """Test that parallel plot workers finish after a (numba) ACO run"""
+    markets = [
+        Market(i, f"M{i}", 48.2 + 0.01 * i, 16.3 + 0.01 * i, time(10, 0), time(12, 0))
+        for i in range(1, 13)
+    ]
+    travel_times = {(a.id, b.id): 10.0 for a in markets for b in markets if a.id != b.id}
+    problem = ProblemInstance(
+        markets=markets,
+        travel_times=travel_times,
+        num_days=2,
+        stay_durations=[30, 30]
+    )
+    
+    daily_solutions = []
+    excluded = []
+    for day in (1, 2):
+        solution = AntColonyOptimizer(problem, num_ants=5, num_iterations=3).solve(
+            day=day, excluded_markets=excluded)
+        excluded += list(solution.route)
+        daily_solutions.append(solution)
+    multi_solution = MultiDaySolution(
+        daily_solutions, sum(s.total_markets_visited for s in daily_solutions), [])
+    
+    output_dir = tempfile.mkdtemp()
+    Visualizer(problem, output_dir).plot_all_days(multi_solution, parallel=True, max_workers=2)
+    
+    for solution in daily_solutions:
+        assert solution.route  # short opening hours leave markets for day 2
+        assert os.path.exists(os.path.join(output_dir, f"day{solution.day}_route_map.png"))
+        assert os.path.exists(os.path.join(output_dir, f"day{solution.day}_gantt.png"))
+        assert os.path.exists(os.path.join(output_dir, f"day{solution.day}_statistics.png"))
+
+
+def test_headless_figures_reused_only_on_request():
+    """Test that headless figures are only pooled with reuse_figures"""
+    markets = [
+        Market(1, "M1", 48.2, 16.3, time(10, 0), time(20, 0)),
+        Market(2, "M2", 48.3, 16.4, time(11, 0), time(21, 0))
+    ]
+    problem = ProblemInstance(
+        markets=markets,
+        travel_times={(1, 2): 15.0},
+        num_days=1,
+        stay_durations=[30]
+    )
+    output_dir = tempfile.mkdtemp()
+    
+    visualizer = Visualizer(problem, output_dir, headless=True)
+    first = visualizer.plot_convergence([1, 2, 2], save=False)[0]
+    second = visualizer.plot_convergence([1, 2, 3], save=False)[0]
+    assert first is not second
+    assert first.axes[0].lines  # the first figure still holds its plot
+    
+    visualizer = Visualizer(problem, output_dir, headless=True, reuse_figures=True)
+    first = visualizer.plot_convergence([1, 2, 2], save=False)[0]
+    second = visualizer.plot_convergence([1, 2, 3], save=False)[0]
+    assert first is second
+
+
+if __name__ == "__main__":
+    test_plot_all_days_after_aco()
+    test_headless_figures_reused_only_on_request()
+    print("✓ All visualization tests passed!")